@@ -0,0 +1,223 @@
+"""
+Incremental per-user rollups of training results.
+
+Every added result updates the daily, weekly and monthly totals of its
+user, both for its training type and for all types together, so a
+rollup query is a single dict lookup. Aggregators built by parallel
+workers are combined with ``merge``.
+"""
+import datetime as dt
+from typing import Hashable, Iterable, Iterator, Optional
+
+from homework import InfoMessage
+
+PERIODS: tuple[str, ...] = ('day', 'week', 'month')
+
+ALL_TYPES: str = '*'
+
+Key = tuple[Hashable, str, dt.date, str]
+
+
+def period_start(period: str, day: dt.date) -> dt.date:
+    """
+    Return the first day of the period containing the day.
+
+    Weeks start on Monday as in ISO 8601.
+
+    Raises:
+    ValueError: unknown period
+    """
+    if period == 'day':
+        return day
+    if period == 'week':
+        return day - dt.timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    raise ValueError(f'Unknown period "{period}", expected one of {PERIODS}')
+
+
+class Totals:
+    """
+    Running sums of the results of several trainings.
+
+    ...
+
+    Attributes
+    ----------
+    count: int
+        number of trainings
+    duration: float
+        total time spent training
+    distance: float
+        total distance covered
+    calories: float
+        total number of calories spent
+
+    Methods
+    -------
+    add(duration, distance, calories) -> None
+        adds the result of one training
+    merge(other) -> None
+        adds the sums of another instance
+    """
+
+    __slots__ = ('count', 'duration', 'distance', 'calories')
+
+    def __init__(self,
+                 count: int = 0,
+                 duration: float = 0.0,
+                 distance: float = 0.0,
+                 calories: float = 0.0
+                 ) -> None:
+        self.count = count
+        self.duration = duration
+        self.distance = distance
+        self.calories = calories
+
+    def add(self, duration: float, distance: float, calories: float) -> None:
+        """Add the result of one training."""
+        self.count += 1
+        self.duration += duration
+        self.distance += distance
+        self.calories += calories
+
+    def merge(self, other: 'Totals') -> None:
+        """Add the sums of another instance."""
+        self.count += other.count
+        self.duration += other.duration
+        self.distance += other.distance
+        self.calories += other.calories
+
+    @property
+    def mean_duration(self) -> float:
+        """Average time spent per training."""
+        return self.duration / self.count if self.count else 0.0
+
+    @property
+    def mean_distance(self) -> float:
+        """Average distance per training."""
+        return self.distance / self.count if self.count else 0.0
+
+    @property
+    def mean_calories(self) -> float:
+        """Average number of calories per training."""
+        return self.calories / self.count if self.count else 0.0
+
+    def __getstate__(self) -> tuple[int, float, float, float]:
+        return self.count, self.duration, self.distance, self.calories
+
+    def __setstate__(self, state: tuple[int, float, float, float]) -> None:
+        self.count, self.duration, self.distance, self.calories = state
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Totals):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __repr__(self) -> str:
+        return (
+            f'{type(self).__name__}(count={self.count}, '
+            f'duration={self.duration}, distance={self.distance}, '
+            f'calories={self.calories})'
+        )
+
+
+class Aggregator:
+    """
+    Daily, weekly and monthly totals per user and training type.
+
+    ...
+
+    Attributes
+    ----------
+    totals: dict[Key, Totals]
+        totals by user, period, first day of the period and training type
+
+    Methods
+    -------
+    add(user, day, info) -> None
+        adds an InfoMessage of the user
+    add_batch(users, days, training_types, durations, distances,
+              calories) -> None
+        adds results given as columns
+    merge(other) -> None
+        adds the totals of another aggregator
+    rollup(user, period, day, training_type) -> Totals
+        returns the totals of the period containing the day
+    """
+
+    __slots__ = ('totals',)
+
+    def __init__(self) -> None:
+        self.totals: dict[Key, Totals] = {}
+
+    def add_result(self,
+                   user: Hashable,
+                   day: dt.date,
+                   training_type: str,
+                   duration: float,
+                   distance: float,
+                   calories: float) -> None:
+        """Add the result of one training of the user."""
+        totals = self.totals
+        for period in PERIODS:
+            start = period_start(period, day)
+            for kind in (training_type, ALL_TYPES):
+                key = (user, period, start, kind)
+                entry = totals.get(key)
+                if entry is None:
+                    entry = totals[key] = Totals()
+                entry.add(duration, distance, calories)
+
+    def add(self, user: Hashable, day: dt.date, info: InfoMessage) -> None:
+        """Add the informational message of a training of the user."""
+        self.add_result(user, day, info.training_type,
+                        info.duration, info.distance, info.calories)
+
+    def add_batch(self,
+                  users: Iterable[Hashable],
+                  days: Iterable[dt.date],
+                  training_types: Iterable[str],
+                  durations: Iterable[float],
+                  distances: Iterable[float],
+                  calories: Iterable[float]) -> None:
+        """Add results given as columns, e.g. from batch.compute_batch."""
+        for row in zip(users, days, training_types,
+                       durations, distances, calories):
+            self.add_result(*row)
+
+    def merge(self, other: 'Aggregator') -> None:
+        """Add the totals of another aggregator, e.g. of a worker."""
+        totals = self.totals
+        for key, entry in other.totals.items():
+            if key in totals:
+                totals[key].merge(entry)
+            else:
+                totals[key] = Totals(*entry.__getstate__())
+
+    def rollup(self,
+               user: Hashable,
+               period: str,
+               day: dt.date,
+               training_type: Optional[str] = None) -> Totals:
+        """
+        Return the totals of the period containing the day.
+
+        Arguments:
+        user: user identifier
+        period: one of PERIODS
+        day: any day of the period
+        training_type: name of the training class, all types if None
+
+        Returns:
+        Totals of the period, empty if there were no trainings
+        """
+        key = (user, period, period_start(period, day),
+               training_type or ALL_TYPES)
+        return self.totals.get(key) or Totals()
+
+    def __iter__(self) -> Iterator[tuple[Key, Totals]]:
+        return iter(self.totals.items())
+
+    def __len__(self) -> int:
+        return len(self.totals)
@@ -0,0 +1,244 @@
+"""
+Vectorized computation of training metrics over column arrays.
+
+Applies the kernels of the classes from ``homework`` to whole columns
+at once instead of building a ``Training`` instance per package. The
+methods of the classes delegate to the same kernels, so results are
+bit-for-bit identical to the per-object path.
+"""
+from types import SimpleNamespace
+from typing import Callable, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from homework import Training, get_workout
+from validate import Rejection, Validator
+
+COLUMNS: tuple[str, ...] = (
+    'action', 'duration', 'weight', 'height', 'length_pool', 'count_pool'
+)
+
+
+class BatchResult(NamedTuple):
+    """
+    Metrics calculated for a batch of trainings.
+
+    ...
+
+    Attributes
+    ----------
+    distance: np.ndarray
+        distance covered during each training
+    speed: np.ndarray
+        average speed during each training
+    calories: np.ndarray
+        number of calories spent during each training
+    """
+
+    distance: np.ndarray
+    speed: np.ndarray
+    calories: np.ndarray
+
+
+Formula = Callable[
+    [type[Training], Mapping[str, np.ndarray]],
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+]
+
+
+def training_distance(cls: type[Training],
+                      col: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Vectorized ``Training.get_distance``."""
+    return cls.KERNEL.distance(SimpleNamespace(action=col['action']))
+
+
+def kernel_formula(cls: type[Training],
+                   col: Mapping[str, np.ndarray]
+                   ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized metrics through the kernel of the training class.
+
+    The kernel is built with ``np.float_power``, which goes through the
+    same C ``pow`` as the ``**`` operator on floats, whereas
+    ``ndarray ** 2`` is reduced to a multiplication and may differ in
+    the last bit. The formulas read the columns as attributes of a
+    namespace, like the attributes of a training.
+    """
+    kernel = cls.build_kernel(np.float_power)
+    if kernel.calories is None:
+        raise KeyError(f'No calorie formula in "{cls.__name__}"')
+    columns = SimpleNamespace(**{name: col[name] for name in cls.PARAMETERS})
+    distance = kernel.distance(columns)
+    speed = kernel.speed(columns, distance)
+    return distance, speed, kernel.calories(columns, speed)
+
+
+def get_formula(workout_type: str) -> tuple[type[Training], Formula]:
+    """
+    Return the training class and the vectorized formula of a code.
+
+    The formula registered with ``homework.register_workout`` takes
+    precedence over the kernel of the training class.
+
+    Raises:
+    UnknownWorkoutTypeError: the code is not registered
+    KeyError: the training type has no calorie formula
+    """
+    workout = get_workout(workout_type)
+    if workout.formula is not None:
+        return workout.training, workout.formula
+    if workout.training.KERNEL.calories is None:
+        raise KeyError(f'No vectorized formula for "{workout_type}"')
+    return workout.training, kernel_formula
+
+
+def compute_batch(workout_types: Sequence[str],
+                  columns: Mapping[str, Sequence[float]]) -> BatchResult:
+    """
+    Calculate distance, mean speed and calories for a batch of packages.
+
+    Arguments:
+    workout_types: training code designation of every row
+    columns: dict of column name and values, one value per row;
+    columns not used by any of the present workout types may be omitted
+
+    Raises:
+    KeyError: unknown training code or a required column is missing
+
+    Returns:
+    BatchResult with float64 arrays in the order of the rows
+    """
+    codes = np.asarray(workout_types)
+    size = len(codes)
+    arrays = {
+        name: np.asarray(values, dtype=np.float64)
+        for name, values in columns.items()
+    }
+    distance = np.empty(size)
+    speed = np.empty(size)
+    calories = np.empty(size)
+    for code in np.unique(codes):
+        cls, formula = get_formula(str(code))
+        mask = codes == code
+        subset = {name: array[mask] for name, array in arrays.items()}
+        (distance[mask],
+         speed[mask],
+         calories[mask]) = formula(cls, subset)
+    return BatchResult(distance, speed, calories)
+
+
+class ValidBatch(NamedTuple):
+    """
+    Metrics of the valid rows of a batch and the report of the others.
+
+    ...
+
+    Attributes
+    ----------
+    result: BatchResult
+        metrics of every row, NaN in the rejected rows
+    valid: np.ndarray
+        boolean mask of the valid rows
+    rejected: list[Rejection]
+        rejected rows with the reason in the order of the rows
+    """
+
+    result: BatchResult
+    valid: np.ndarray
+    rejected: list[Rejection]
+
+
+def inside_limits(columns: Mapping[str, np.ndarray], size: int,
+                  validator: Validator) -> np.ndarray:
+    """
+    Check columns of parameters against the limits of a validator.
+
+    Returns:
+    boolean mask of the rows whose values are all within the limits,
+    False for NaN
+    """
+    inside = np.ones(size, dtype=bool)
+    for name, values in columns.items():
+        low, high = validator.bounds(name)
+        inside &= values >= low
+        inside &= values <= high
+    return inside
+
+
+def row_error(workout_type: str, columns: Mapping[str, np.ndarray],
+              row: int, validator: Validator) -> str:
+    """Explain why a row of columns of parameters is invalid."""
+    data = [
+        float(columns[name][row])
+        for name in get_workout(workout_type).fields
+    ]
+    return validator.error(workout_type, data) or 'invalid package'
+
+
+def _reject_rows(rejected: list[Rejection], rows: np.ndarray,
+                 workout_type: str, reason: str) -> None:
+    """Report the same reason for all the rows."""
+    rejected.extend(Rejection(int(row), workout_type, reason) for row in rows)
+
+
+def compute_valid_batch(workout_types: Sequence[str],
+                        columns: Mapping[str, Sequence[float]],
+                        validator: Optional[Validator] = None
+                        ) -> ValidBatch:
+    """
+    Validate a batch of packages and calculate the metrics of valid rows.
+
+    Unlike compute_batch, unknown training codes, missing columns and
+    values out of the limits of the validator, NaN included, reject the
+    row instead of failing the batch. The ranges are checked on the
+    column arrays, the reasons are worked out only for rejected rows.
+
+    Arguments:
+    workout_types: training code designation of every row
+    columns: dict of column name and values, one value per row
+    validator: limits to check against, validate.LIMITS by default
+
+    Returns:
+    ValidBatch with the results, the mask of valid rows and the report
+    """
+    validator = validator or Validator()
+    codes = np.asarray(workout_types)
+    size = len(codes)
+    arrays = {
+        name: np.asarray(values, dtype=np.float64)
+        for name, values in columns.items()
+    }
+    result = BatchResult(
+        np.full(size, np.nan), np.full(size, np.nan), np.full(size, np.nan)
+    )
+    valid = np.zeros(size, dtype=bool)
+    rejected: list[Rejection] = []
+    for code in np.unique(codes):
+        workout_type = str(code)
+        rows = np.flatnonzero(codes == code)
+        try:
+            cls, formula = get_formula(workout_type)
+        except KeyError as error:
+            _reject_rows(rejected, rows, workout_type, str(error))
+            continue
+        missing = [name for name in cls.PARAMETERS if name not in arrays]
+        if missing:
+            _reject_rows(rejected, rows, workout_type,
+                         f'Missing columns {missing}')
+            continue
+        subset = {name: arrays[name][rows] for name in cls.PARAMETERS}
+        inside = inside_limits(subset, len(rows), validator)
+        if not inside.all():
+            for row in rows[~inside]:
+                rejected.append(Rejection(
+                    int(row), workout_type,
+                    row_error(workout_type, arrays, row, validator)
+                ))
+            rows = rows[inside]
+            subset = {name: values[inside] for name, values in subset.items()}
+        (result.distance[rows],
+         result.speed[rows],
+         result.calories[rows]) = formula(cls, subset)
+        valid[rows] = True
+    rejected.sort()
+    return ValidBatch(result, valid, rejected)
@@ -0,0 +1,69 @@
+"""
+Per-instance memory of the slotted training classes and InfoMessage.
+
+Every class is compared with an equivalent class without ``__slots__``,
+which has the layout the classes had before, using tracemalloc.
+
+Usage:
+python -m benchmarks.bench_memory [--size N]
+"""
+import argparse
+import dataclasses
+import inspect
+import tracemalloc
+from typing import Callable
+
+from homework import InfoMessage, Running, SportsWalking, Swimming
+
+
+def per_instance(factory: Callable[[], object], size: int) -> float:
+    """Return the average number of bytes allocated per instance."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [factory() for _ in range(size)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del instances
+    return (after - before) / size
+
+
+def unslotted(cls: type) -> type:
+    """Return an equivalent class whose instances have a ``__dict__``."""
+    if dataclasses.is_dataclass(cls):
+        return dataclasses.make_dataclass(
+            cls.__name__,
+            [(field.name, field.type) for field in dataclasses.fields(cls)]
+        )
+    params = tuple(inspect.signature(cls).parameters)
+
+    def __init__(self, *args: object) -> None:
+        for name, value in zip(params, args):
+            setattr(self, name, value)
+
+    return type(cls.__name__, (), {'__init__': __init__})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=100_000)
+    args = parser.parse_args()
+
+    cases = [
+        (Swimming, (720, 1.0, 80.0, 25, 40)),
+        (Running, (15000, 1.0, 75.0)),
+        (SportsWalking, (9000, 1.0, 75.0, 180.0)),
+        (InfoMessage, ('Running', 1.0, 9.75, 9.75, 797.805)),
+    ]
+    print(f'{"class":>14} {"dict, B":>8} {"slots, B":>8} {"saved":>6}')
+    for cls, data in cases:
+        plain_cls = unslotted(cls)
+        plain = per_instance(lambda: plain_cls(*data), args.size)
+        slotted = per_instance(lambda: cls(*data), args.size)
+        print(f'{cls.__name__:>14} {plain:>8.1f} {slotted:>8.1f} '
+              f'{1 - slotted / plain:>6.0%}')
+
+
+if __name__ == '__main__':
+    main()
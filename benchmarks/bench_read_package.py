@@ -0,0 +1,46 @@
+"""
+Throughput of read_package compared with its previous implementation.
+
+Usage:
+python -m benchmarks.bench_read_package [--size N]
+"""
+import argparse
+
+from benchmarks.common import best_of, make_packages
+from homework import Running, SportsWalking, Swimming, Training, read_package
+
+
+def legacy_read_package(workout_type: str, data: list[int]) -> Training:
+    """read_package before the registry: builds the dict on every call."""
+    types_training: dict[
+        str, type[Training]
+    ] = {
+        'SWM': Swimming,
+        'RUN': Running,
+        'WLK': SportsWalking
+    }
+    try:
+        return types_training[workout_type](*data)
+    except KeyError:
+        raise KeyError
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    packages = list(make_packages(args.size))
+    print(f'{"implementation":>15} {"seconds":>9} {"pkg/s":>12}')
+    for name, func in [('before', legacy_read_package),
+                       ('after', read_package)]:
+        seconds = best_of(
+            lambda: [func(code, data) for code, data in packages],
+            args.repeat
+        )
+        print(f'{name:>15} {seconds:>9.3f} {args.size / seconds:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+Throughput of the registered renderers against InfoMessage.get_message.
+
+Usage:
+python -m benchmarks.bench_render [--size N] [--repeat N]
+"""
+import argparse
+
+import render
+from benchmarks.common import best_of
+from benchmarks.suite import trainings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    messages = [training.show_training_info()
+                for training in trainings(args.size)]
+    baseline = best_of(
+        lambda: [info.get_message() for info in messages], args.repeat
+    )
+    print(f'{"renderer":>12} {"msg/s":>12} {"vs get_message":>15}')
+    print(f'{"get_message":>12} {args.size / baseline:>12,.0f} '
+          f'{1:>15.2f}')
+    for name, renderer in render.RENDERERS.items():
+        seconds = best_of(lambda: renderer.render_many(messages),
+                          args.repeat)
+        print(f'{name:>12} {args.size / seconds:>12,.0f} '
+              f'{baseline / seconds:>15.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Memory of training results kept as InfoMessage lists and ResultTable.
+
+Records are created from random values; "parsed names" gives every
+record its own copy of the training type string, as when the records
+are loaded from an export, "shared names" reuses the class name as
+show_training_info does.
+
+Usage:
+python -m benchmarks.bench_results [--size N]
+"""
+import argparse
+import random
+import tracemalloc
+from typing import Callable, Iterator
+
+from homework import InfoMessage
+from results import ResultTable
+
+NAMES: tuple[str, ...] = ('Swimming', 'Running', 'SportsWalking')
+
+
+def make_messages(size: int, copy_names: bool,
+                  seed: int = 0) -> Iterator[InfoMessage]:
+    """Yield size messages with random values."""
+    rnd = random.Random(seed)
+    for _ in range(size):
+        name = rnd.choice(NAMES)
+        if copy_names:
+            name = name[:1] + name[1:]
+        yield InfoMessage(name, rnd.random(), rnd.random(), rnd.random(),
+                          rnd.random())
+
+
+def allocated(factory: Callable[[], object]) -> tuple[int, object]:
+    """Return the bytes allocated by the factory and its result."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = factory()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return after - before, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    print(f'{"layout":>26} {"MiB":>9} {"B/record":>9}')
+    for copy_names in (False, True):
+        label = 'parsed names' if copy_names else 'shared names'
+        for layout, build in (
+            ('list', list),
+            ('ResultTable', ResultTable),
+        ):
+            size, records = allocated(
+                lambda: build(make_messages(args.size, copy_names))
+            )
+            del records
+            print(f'{layout + ", " + label:>26} {size / 2 ** 20:>9.1f} '
+                  f'{size / args.size:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
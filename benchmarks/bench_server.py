@@ -0,0 +1,73 @@
+"""
+Load generator for the package server.
+
+Opens many concurrent connections that send packages one after another
+and reports p50/p99 latency and packages per second. Without --port or
+--unix an in-process server is started on a free port.
+
+Usage:
+python -m benchmarks.bench_server [--connections N] [--packages N]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.common import make_packages
+from server import PackageClient, PackageServer
+
+
+async def device(client: PackageClient,
+                 packages: list[tuple[str, list[float]]],
+                 latencies: list[float]) -> None:
+    """Send the packages one by one and record the latency of each."""
+    for package in packages:
+        start = time.perf_counter()
+        await client.send(*package)
+        latencies.append(time.perf_counter() - start)
+
+
+async def load(args: argparse.Namespace) -> None:
+    """Run the load and print the statistics."""
+    server = None
+    port, path = args.port, args.unix
+    if port is None and path is None:
+        server = PackageServer(binary=args.binary)
+        listener = await server.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+    packages = list(make_packages(args.packages))
+    clients = [
+        await PackageClient.connect(args.host, port, path)
+        for _ in range(args.connections)
+    ]
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        device(client, packages, latencies) for client in clients
+    ))
+    seconds = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    if server is not None:
+        await server.close()
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f'connections: {args.connections}, packages: {len(latencies)}')
+    print(f'p50: {percentiles[49] * 1000:.3f} ms, '
+          f'p99: {percentiles[98] * 1000:.3f} ms, '
+          f'throughput: {len(latencies) / seconds:,.0f} pkg/s')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--unix', metavar='PATH')
+    parser.add_argument('--binary', action='store_true')
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--packages', type=int, default=20,
+                        help='packages sent by every connection')
+    asyncio.run(load(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
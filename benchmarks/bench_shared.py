@@ -0,0 +1,84 @@
+"""
+Result transport of the parallel pipeline: pickling against shared memory.
+
+Both paths compute the same chunks on the same pool size; the consumer
+either sums the calories of every chunk or formats the messages into a
+discarded buffer.
+
+Usage:
+python -m benchmarks.bench_shared [--size N] [--workers N] [--chunk-size N]
+"""
+import argparse
+import io
+import os
+
+import pipeline
+import sharedmem
+from benchmarks.common import best_of, make_dump
+from homework import format_messages
+
+
+def sum_pickled(dump: list[str], workers: int, chunk_size: int) -> float:
+    return sum(
+        info.calories
+        for chunk in pipeline.process_stream_parallel(dump, workers,
+                                                      chunk_size)
+        for info in chunk
+    )
+
+
+def sum_shared(dump: list[str], workers: int, chunk_size: int) -> float:
+    return sum(
+        sum(chunk.columns['calories'])
+        for chunk in sharedmem.process_stream_shared(dump, workers,
+                                                     chunk_size)
+    )
+
+
+def format_pickled(dump: list[str], workers: int, chunk_size: int) -> int:
+    return pipeline.write_messages(
+        pipeline.process_stream_parallel(dump, workers, chunk_size),
+        io.StringIO()
+    )
+
+
+def format_shared(dump: list[str], workers: int, chunk_size: int) -> int:
+    output = io.StringIO()
+    return sum(
+        format_messages(chunk, output)
+        for chunk in sharedmem.process_stream_shared(dump, workers,
+                                                     chunk_size)
+    )
+
+
+CASES = {
+    'sum calories': (sum_pickled, sum_shared),
+    'format': (format_pickled, format_shared),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=500_000)
+    parser.add_argument('--workers', type=int,
+                        default=max(os.cpu_count() or 1, 2))
+    parser.add_argument('--chunk-size', type=int, default=4096)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    dump = list(make_dump(args.size))
+    print(f'{"consumer":>14} {"pickle s":>9} {"shared s":>9} {"speedup":>8}')
+    for name, (pickled, shared) in CASES.items():
+        assert pickled(dump[:1000], 2, 100) == shared(dump[:1000], 2, 100)
+        before = best_of(
+            lambda: pickled(dump, args.workers, args.chunk_size), args.repeat
+        )
+        after = best_of(
+            lambda: shared(dump, args.workers, args.chunk_size), args.repeat
+        )
+        print(f'{name:>14} {before:>9.3f} {after:>9.3f} '
+              f'{before / after:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Import time of the command line entry points.
+
+Runs ``python -X importtime`` in fresh interpreters, reports the
+cumulative import time of the entry point modules, checks that the
+minimal path stays under the budget and that heavy optional modules
+are not imported by it.
+
+Usage:
+python -m benchmarks.bench_startup [--budget-ms MS] [--repeat N]
+"""
+import argparse
+import subprocess
+import sys
+
+# Modules whose import must stay within the budget.
+MINIMAL: tuple[str, ...] = ('homework', 'pipeline')
+
+# Optional pieces that the minimal path must not import.
+HEAVY: tuple[str, ...] = (
+    'numpy', 'asyncio', 'concurrent.futures', 'multiprocessing',
+    'importlib.metadata', 'batch', 'server',
+)
+
+
+def import_time(module: str) -> tuple[float, set[str]]:
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+    cumulative import time in milliseconds and the imported modules
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True
+    )
+    cumulative = 0.0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        if not cumulative_us.strip().isdigit():
+            continue
+        imported.add(name.strip())
+        if name.strip() == module:
+            cumulative = int(cumulative_us) / 1000
+    return cumulative, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--budget-ms', type=float, default=50.0,
+                        help='budget for the import of every minimal module')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('modules', nargs='*', default=list(MINIMAL))
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        best = float('inf')
+        for _ in range(args.repeat):
+            milliseconds, imported = import_time(module)
+            best = min(best, milliseconds)
+        heavy = sorted(imported.intersection(HEAVY))
+        status = 'ok'
+        if module in MINIMAL and (best > args.budget_ms or heavy):
+            status = 'OVER BUDGET' if best > args.budget_ms else 'HEAVY'
+            failed = True
+        print(f'{module:>12} {best:>8.1f} ms  {status}'
+              + (f'  imports {", ".join(heavy)}' if heavy else ''))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
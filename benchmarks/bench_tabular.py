@@ -0,0 +1,85 @@
+"""
+Throughput of the bulk CSV/JSONL readers and writers.
+
+Writes a CSV package file of the requested size to a temporary
+directory, then times reading it in batches, computing the messages,
+and writing them as CSV and JSONL, compared with one print per row.
+
+Usage:
+python -m benchmarks.bench_tabular [--size N]
+"""
+import argparse
+import contextlib
+import csv
+import os
+import tempfile
+import time
+from typing import Callable
+
+import tabular
+from benchmarks.common import FIELDS, make_packages
+from homework import main as print_message, read_package
+from store import COLUMNS
+
+
+def timed(label: str, size: int, func: Callable[[], object]) -> object:
+    """Run func once and print its throughput."""
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    print(f'{label:>24} {seconds:>9.2f} s {size / seconds:>14,.0f} rows/s')
+    return result
+
+
+def write_input(path: str, size: int) -> None:
+    """Write a CSV package file with ``size`` random packages."""
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(('workout_type',) + COLUMNS)
+        for workout_type, data in make_packages(size):
+            values = dict(zip(FIELDS[workout_type], data))
+            writer.writerow(
+                [workout_type] + [values.get(name, '') for name in COLUMNS]
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=10_000_000)
+    args = parser.parse_args()
+    size = args.size
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'packages.csv')
+        write_input(source, size)
+
+        def read() -> list:
+            with open(source, newline='', encoding='utf-8') as file:
+                return [
+                    package for batch in tabular.read_csv_packages(file)
+                    for package in batch
+                ]
+
+        packages = timed('read_csv_packages', size, read)
+        messages = timed('compute messages', size, lambda: [
+            read_package(*package).show_training_info()
+            for package in packages
+        ])
+        for name, writer in [('write_csv', tabular.write_csv),
+                             ('write_jsonl', tabular.write_jsonl)]:
+            target = os.path.join(directory, name)
+            with open(target, 'w', newline='', encoding='utf-8') as file:
+                timed(name, size, lambda: writer(messages, file))
+
+        def print_rows() -> None:
+            target = os.path.join(directory, 'print.txt')
+            with open(target, 'w', encoding='utf-8') as file, \
+                    contextlib.redirect_stdout(file):
+                for package in packages:
+                    print_message(read_package(*package))
+
+        timed('per-row main (print)', size, print_rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Scaling of the buffer batch computation with the number of threads.
+
+Usage:
+python -m benchmarks.bench_threads [--size N] [--block-size N]
+"""
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import parallel
+from benchmarks.common import best_of
+
+
+def make_columns(workout_type: str, size: int,
+                 seed: int = 0) -> dict[str, np.ndarray]:
+    """Return random but plausible columns of one training type."""
+    rng = np.random.default_rng(seed)
+    columns = {
+        'action': rng.integers(100, 30000, size).astype(np.float64),
+        'duration': rng.uniform(0.2, 3, size),
+        'weight': rng.uniform(40, 120, size),
+    }
+    if workout_type == 'WLK':
+        columns['height'] = rng.uniform(140, 210, size)
+    elif workout_type == 'SWM':
+        columns['length_pool'] = rng.choice([25.0, 50.0], size)
+        columns['count_pool'] = rng.integers(1, 100, size).astype(np.float64)
+    return columns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=4_000_000)
+    parser.add_argument('--block-size', type=int,
+                        default=parallel.DEFAULT_BLOCK_SIZE)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({n for n in (1, 2, 4, 8, cpus) if n <= max(cpus, 2)})
+    print(f'{"type":>5} {"threads":>8} {"seconds":>9} {"rows/s":>14} '
+          f'{"speedup":>8}')
+    for workout_type in ('SWM', 'RUN', 'WLK'):
+        columns = make_columns(workout_type, args.size)
+        baseline = None
+        for threads in counts:
+            with ThreadPoolExecutor(threads) as executor:
+                seconds = best_of(
+                    lambda: parallel.compute_buffers(
+                        workout_type, columns, executor, args.block_size
+                    ),
+                    args.repeat
+                )
+            baseline = baseline or seconds
+            print(f'{workout_type:>5} {threads:>8} {seconds:>9.3f} '
+                  f'{args.size / seconds:>14,.0f} '
+                  f'{baseline / seconds:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
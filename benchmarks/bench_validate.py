@@ -0,0 +1,82 @@
+"""
+Overhead of the validation stage on the package, stream and batch paths.
+
+Usage:
+python -m benchmarks.bench_validate [--packages N] [--size N]
+"""
+import argparse
+from collections import deque
+
+import numpy as np
+
+import batch
+import homework
+import pipeline
+import validate
+from benchmarks.bench_threads import make_columns
+from benchmarks.common import best_of, make_dump, make_packages
+
+
+def make_batch(size: int) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Return codes and columns of size rows of mixed training types."""
+    codes = np.random.default_rng(0).choice(
+        np.array(['SWM', 'RUN', 'WLK']), size
+    )
+    columns = {name: np.empty(size) for name in batch.COLUMNS}
+    for code in ('SWM', 'RUN', 'WLK'):
+        mask = codes == code
+        for name, values in make_columns(code, int(mask.sum())).items():
+            columns[name][mask] = values
+    return codes, columns
+
+
+def report(name: str, before: float, after: float) -> None:
+    print(f'{name:>8} {before:>9.3f} {after:>9.3f} '
+          f'{(after / before - 1) * 100:>+9.1f}%')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--packages', type=int, default=1_000_000,
+                        help='packages of the per-package path')
+    parser.add_argument('--size', type=int, default=10_000_000,
+                        help='rows of the batch path')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"path":>8} {"plain s":>9} {"valid s":>9} {"overhead":>10}')
+    packages = list(make_packages(args.packages))
+
+    def messages(source):
+        return deque(
+            (homework.read_package(*package).show_training_info()
+             for package in source),
+            maxlen=0
+        )
+
+    report(
+        'package',
+        best_of(lambda: messages(packages), args.repeat),
+        best_of(lambda: messages(validate.filter_packages(packages, [])),
+                args.repeat)
+    )
+
+    dump = list(make_dump(args.packages))
+    report(
+        'stream',
+        best_of(lambda: messages(pipeline.iter_packages(dump)), args.repeat),
+        best_of(lambda: deque(pipeline.stream_messages(dump, []), maxlen=0),
+                args.repeat)
+    )
+
+    codes, columns = make_batch(args.size)
+    report(
+        'batch',
+        best_of(lambda: batch.compute_batch(codes, columns), args.repeat),
+        best_of(lambda: batch.compute_valid_batch(codes, columns),
+                args.repeat)
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Scaling of the parallel pipeline with the number of worker processes.
+
+Usage:
+python -m benchmarks.bench_workers [--size N] [--chunk-size N]
+"""
+import argparse
+import os
+from collections import deque
+
+import pipeline
+from benchmarks.common import best_of, make_dump
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=4096)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    dump = list(make_dump(args.size))
+    cpus = os.cpu_count() or 1
+    counts = sorted({n for n in (1, 2, 4, 8, cpus) if n <= cpus})
+    baseline = None
+    print(f'{"workers":>8} {"seconds":>9} {"pkg/s":>12} {"speedup":>8}')
+    for workers in counts:
+        seconds = best_of(
+            lambda: deque(pipeline.process_stream_parallel(
+                dump, workers, args.chunk_size), maxlen=0),
+            args.repeat
+        )
+        baseline = baseline or seconds
+        print(f'{workers:>8} {seconds:>9.3f} {args.size / seconds:>12,.0f} '
+              f'{baseline / seconds:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
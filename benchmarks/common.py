@@ -0,0 +1,51 @@
+"""
+Helpers shared by the benchmarks.
+
+Benchmarks are run from the repository root, e.g.
+python -m benchmarks.bench_workers
+"""
+import json
+import random
+import time
+from typing import Callable, Iterator
+
+FIELDS: dict[str, tuple[str, ...]] = {
+    'SWM': ('action', 'duration', 'weight', 'length_pool', 'count_pool'),
+    'RUN': ('action', 'duration', 'weight'),
+    'WLK': ('action', 'duration', 'weight', 'height'),
+}
+
+
+def make_packages(size: int,
+                  seed: int = 0) -> Iterator[tuple[str, list[float]]]:
+    """Yield ``size`` random but plausible packages."""
+    rnd = random.Random(seed)
+    codes = list(FIELDS)
+    for _ in range(size):
+        workout_type = rnd.choice(codes)
+        data = [
+            rnd.randint(100, 30000),
+            round(rnd.uniform(0.2, 3), 3),
+            round(rnd.uniform(40, 120), 1),
+        ]
+        if workout_type == 'WLK':
+            data.append(round(rnd.uniform(140, 210), 1))
+        elif workout_type == 'SWM':
+            data.extend([rnd.choice([25, 50]), rnd.randint(1, 100)])
+        yield workout_type, data
+
+
+def make_dump(size: int, seed: int = 0) -> Iterator[str]:
+    """Yield ``size`` lines of a newline-delimited package dump."""
+    for package in make_packages(size, seed):
+        yield json.dumps(package) + '\n'
+
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> float:
+    """Return the best wall-clock time of ``repeat`` calls in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
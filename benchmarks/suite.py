@@ -0,0 +1,176 @@
+"""
+Benchmark suite of the metric and formatting hot paths.
+
+Every case is timed at several input sizes, the results are stored as
+JSON and can be compared with a previous run; the comparison fails
+when the throughput of a case drops by more than the threshold.
+
+Usage:
+python -m benchmarks.suite [--sizes N ...] [--output FILE]
+python -m benchmarks.suite --compare BASELINE [--threshold 0.1]
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, NamedTuple
+
+import homework
+from benchmarks.common import make_packages
+
+
+class Case(NamedTuple):
+    """Benchmark case: fresh state for a size and the timed function."""
+
+    setup: Callable[[int], Any]
+    run: Callable[[Any], object]
+
+
+def packages_of(workout_type: str, size: int) -> list:
+    """Return ``size`` random packages of one training type."""
+    packages = []
+    seed = 0
+    while len(packages) < size:
+        packages.extend(
+            package for package in make_packages(size, seed)
+            if package[0] == workout_type
+        )
+        seed += 1
+    return packages[:size]
+
+
+def trainings(size: int, workout_type: str = '') -> list:
+    """Return training instances of the packages of a workout type."""
+    packages = (
+        packages_of(workout_type, size) if workout_type
+        else make_packages(size)
+    )
+    return [homework.read_package(*package) for package in packages]
+
+
+def run_main(packages: list) -> None:
+    """Run read_package and main over the packages, discarding output."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for package in packages:
+            homework.main(homework.read_package(*package))
+
+
+CASES: dict[str, Case] = {
+    'read_package': Case(
+        lambda size: list(make_packages(size)),
+        lambda packages: [homework.read_package(*p) for p in packages],
+    ),
+    'calories_running': Case(
+        lambda size: trainings(size, 'RUN'),
+        lambda items: [training.get_spent_calories() for training in items],
+    ),
+    'calories_walking': Case(
+        lambda size: trainings(size, 'WLK'),
+        lambda items: [training.get_spent_calories() for training in items],
+    ),
+    'calories_swimming': Case(
+        lambda size: trainings(size, 'SWM'),
+        lambda items: [training.get_spent_calories() for training in items],
+    ),
+    'show_training_info': Case(
+        trainings,
+        lambda items: [training.show_training_info() for training in items],
+    ),
+    'get_message': Case(
+        lambda size: [training.show_training_info()
+                      for training in trainings(size)],
+        lambda messages: [info.get_message() for info in messages],
+    ),
+    'main': Case(
+        lambda size: list(make_packages(size)),
+        run_main,
+    ),
+}
+
+
+def measure(case: Case, size: int, repeat: int) -> float:
+    """Return the best time of ``repeat`` runs, each on a fresh state."""
+    best = float('inf')
+    for _ in range(repeat):
+        state = case.setup(size)
+        start = time.perf_counter()
+        case.run(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(sizes: list[int], repeat: int,
+              names: list[str]) -> dict[str, Any]:
+    """Run the cases and return the results as a JSON-ready dict."""
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for name in names:
+        results[name] = {}
+        for size in sizes:
+            seconds = measure(CASES[name], size, repeat)
+            results[name][str(size)] = {
+                'seconds': seconds,
+                'ops_per_sec': size / seconds,
+            }
+            print(f'{name:>20} {size:>9} {size / seconds:>14,.0f} ops/s')
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any],
+            threshold: float) -> list[str]:
+    """
+    Compare the throughput of two runs.
+
+    Returns:
+    descriptions of the cases slower than the baseline by more than
+    the threshold, a fraction of the baseline throughput
+    """
+    regressions = []
+    for name, sizes in current['results'].items():
+        for size, result in sizes.items():
+            before = baseline['results'].get(name, {}).get(size)
+            if before is None:
+                continue
+            ratio = result['ops_per_sec'] / before['ops_per_sec']
+            if ratio < 1 - threshold:
+                regressions.append(
+                    f'{name} at {size}: {ratio - 1:+.1%} throughput'
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1_000, 10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--cases', nargs='+', choices=list(CASES),
+                        default=list(CASES))
+    parser.add_argument('--output', help='file to store the results in')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='results of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed throughput drop, 0.1 is 10%%')
+    args = parser.parse_args()
+
+    current = run_suite(args.sizes, args.repeat, args.cases)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(current, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            regressions = compare(json.load(file), current, args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Bounded cache of the messages for retransmitted packages.
+
+Devices resend identical packages after reconnects; the cache keeps the
+message text of the most recently used packages, keyed by
+``(workout_type, tuple(data))``, and evicts the least recently used one
+when it is full.
+"""
+from functools import lru_cache
+from typing import Hashable
+
+from homework import WORKOUT_TYPES, read_package
+
+
+def constants_fingerprint() -> tuple[Hashable, ...]:
+    """
+    Return the registered training types with their class constants.
+
+    Constants are the upper-case class attributes, including inherited
+    ones such as ``Running.RATIO_SPEED`` or ``Training.M_IN_KM``.
+    """
+    fingerprint = []
+    for code, workout in sorted(WORKOUT_TYPES.items()):
+        constants = {}
+        for cls in reversed(workout.training.__mro__):
+            constants.update(
+                (name, value) for name, value in vars(cls).items()
+                if name.isupper()
+            )
+        fingerprint.append(
+            (code, workout.training, tuple(sorted(constants.items())))
+        )
+    return tuple(fingerprint)
+
+
+def _compute_message(workout_type: str, data: tuple[float, ...]) -> str:
+    """Compute the message text of a package."""
+    return read_package(workout_type, list(data)).show_training_info(
+    ).get_message()
+
+
+class MessageCache:
+    """
+    LRU cache in front of read_package, show_training_info and get_message.
+
+    Changing class constants or the registry does not reach cached
+    messages by itself: call ``invalidate`` after such a change, or
+    ``check_constants`` to invalidate only if something changed.
+
+    ...
+
+    Attributes
+    ----------
+    maxsize: int
+        maximum number of cached messages
+
+    Methods
+    -------
+    get_message(workout_type, data) -> str
+        returns the message text of a package
+    info() -> CacheInfo
+        returns hits, misses, maxsize and current size
+    invalidate() -> None
+        drops all cached messages and statistics
+    check_constants() -> bool
+        invalidates the cache if the class constants changed
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        """
+        Creates an empty cache.
+
+
+        Parameters
+        ----------
+        maxsize: int
+            maximum number of cached messages
+        """
+        if maxsize < 1:
+            raise ValueError(f'Cache size must be positive, got {maxsize}')
+        self.maxsize = maxsize
+        self._lookup = lru_cache(maxsize)(_compute_message)
+        self._fingerprint = constants_fingerprint()
+
+    def get_message(self, workout_type: str, data: list[float]) -> str:
+        """Return the message text of a package, computing it on a miss."""
+        return self._lookup(workout_type, tuple(data))
+
+    def info(self) -> tuple[int, int, int, int]:
+        """Return hits, misses, maxsize and current size of the cache."""
+        return self._lookup.cache_info()
+
+    def invalidate(self) -> None:
+        """Drop all cached messages and reset the statistics."""
+        self._lookup.cache_clear()
+        self._fingerprint = constants_fingerprint()
+
+    def check_constants(self) -> bool:
+        """
+        Invalidate the cache if the class constants changed.
+
+        Returns:
+        True if the cache was invalidated
+        """
+        if constants_fingerprint() == self._fingerprint:
+            return False
+        self.invalidate()
+        return True
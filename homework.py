@@ -1,8 +1,68 @@
-from dataclasses import asdict, dataclass
-from typing import ClassVar, Union
+import sys
+from dataclasses import dataclass
+from math import isfinite
+from operator import attrgetter
+from string import Formatter
+from typing import (Any, Callable, ClassVar, Iterable, NamedTuple, Optional,
+                    Sequence, TextIO, Union)
 
 
-@dataclass
+def fields_getter(names: Sequence[str]) -> Callable[[Any], tuple]:
+    """
+    Return a getter of the named attributes of an object as a tuple.
+
+    Unlike a bare attrgetter, the result is a tuple for any number of
+    names, so it can always be unpacked into str.format.
+    """
+    if len(names) > 1:
+        return attrgetter(*names)
+    if names:
+        getter = attrgetter(names[0])
+        return lambda obj: (getter(obj),)
+    return lambda obj: ()
+
+
+def parse_template(template: str) -> tuple[str, tuple[str, ...]]:
+    """
+    Turn the named fields of a template into positional ones.
+
+    Arguments:
+    template: str.format template referring to attributes by name
+
+    Returns:
+    the same template with positional fields and the names of the
+    fields in their order
+    """
+    parts = []
+    names = []
+    for literal, name, spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if name is not None:
+            parts.append(
+                '{' + (f'!{conversion}' if conversion else '')
+                + (f':{spec}' if spec else '') + '}'
+            )
+            names.append(name)
+    return ''.join(parts), tuple(names)
+
+
+def compile_template(template: str
+                     ) -> tuple[str, Callable[[Any], tuple]]:
+    """
+    Precompile a template with named fields.
+
+    Arguments:
+    template: str.format template referring to attributes by name
+
+    Returns:
+    the same template with positional fields and a getter
+    that reads the fields from an object in their order as a tuple
+    """
+    positional, names = parse_template(template)
+    return positional, fields_getter(names)
+
+
+@dataclass(slots=True)
 class InfoMessage:
     """
     A class for storing and displaying information.
@@ -32,6 +92,10 @@ class InfoMessage:
         line for displaying the speed of movement
     CALORIES: str
         line for displaying of calories spent
+    MESSAGE: str
+        template of the message about the training
+    FORMAT: tuple[str, Callable]
+        MESSAGE precompiled with compile_template
 
     Methods
     -------
@@ -53,13 +117,139 @@ class InfoMessage:
         'Ср. скорость: {speed:.3f} км/ч; '
         'Потрачено ккал: {calories:.3f}.'
     )
+    FORMAT: ClassVar[tuple[str, Callable[[Any], tuple]]] = (
+        compile_template(MESSAGE)
+    )
 
     def get_message(self) -> str:
         """Displays a message about the training session."""
-        return self.MESSAGE.format(**asdict(self))
+        template, fields = self.FORMAT
+        return template.format(*fields(self))
+
+
+def format_messages(messages: Iterable[InfoMessage], output: TextIO) -> int:
+    """
+    Write the text of the messages to a text buffer or file.
+
+    Arguments:
+    messages: instances of the class InfoMessage
+    output: text buffer or file opened for writing
+
+    Returns:
+    number of written messages
+    """
+    count = 0
+    template, fields = InfoMessage.FORMAT
+    render = template.format
+    for info in messages:
+        output.write(render(*fields(info)))
+        output.write('\n')
+        count += 1
+    return count
+
+
+def all_finite(values: Sequence[float]) -> bool:
+    """
+    Check that none of the values is infinite or NaN.
+
+    The sum is finite if every value is, so the values are only checked
+    one by one in the rare other case, where the sum may also overflow.
+    """
+    return isfinite(sum(values)) or all(map(isfinite, values))
+
+
+class Kernel(NamedTuple):
+    """
+    Metric formulas of a training type specialized with its constants.
+
+    Every formula takes one object with the parameters of the training
+    type as attributes: the training itself, or a namespace of NumPy
+    arrays of equal length in ``batch``. The speed formula also takes
+    the distance and the calorie formula the speed, so every metric of
+    a message is evaluated once. The formulas keep the order of
+    operations of the original methods, so results of single trainings
+    and of batches are identical.
+
+    ...
+
+    Attributes
+    ----------
+    distance: Callable[..., Any]
+        distance in kilometers, of the training
+    speed: Callable[..., Any]
+        average speed of movement, of the training and the distance
+    calories: Optional[Callable[..., Any]]
+        number of calories spent, of the training and the speed; None
+        if the type defines no formula
+    """
 
+    distance: Callable[..., Any]
+    speed: Callable[..., Any]
+    calories: Optional[Callable[..., Any]] = None
 
-class Training:
+
+# Methods of the metrics; a class overriding any of them is shown
+# through its methods instead of its kernel.
+METRIC_METHODS: tuple[str, ...] = (
+    'get_distance', 'get_mean_speed', 'get_spent_calories'
+)
+
+
+class TrainingMeta(type):
+    """
+    Metaclass building the kernel of every training class.
+
+    The kernel is built when the class is created and rebuilt for the
+    class and its subclasses whenever a class constant or a metric
+    method is changed. A class defining its own constructor has to
+    declare its PARAMETERS, otherwise packages would be read with the
+    arity of the parent.
+    """
+
+    def __init__(cls, name: str, bases: tuple[type, ...],
+                 namespace: dict[str, Any], **kwargs: Any) -> None:
+        super().__init__(name, bases, namespace, **kwargs)
+        if '__init__' in namespace and 'PARAMETERS' not in namespace:
+            raise TypeError(
+                f'Class "{name}" defines __init__ without PARAMETERS'
+            )
+        cls._build()
+
+    def _build(cls) -> None:
+        """Build the kernel and note whether a metric method is overridden."""
+        root = [base for base in cls.__mro__
+                if isinstance(base, TrainingMeta)][-1]
+        if cls is root and '_metric_methods' not in cls.__dict__:
+            # The kernels stand for the metric methods of the root class
+            # as it is defined, so a later patch of them counts too.
+            type.__setattr__(cls, '_metric_methods', tuple(
+                getattr(cls, name, None) for name in METRIC_METHODS
+            ))
+        type.__setattr__(cls, 'KERNEL', cls.build_kernel())
+        type.__setattr__(cls, '_overrides_metrics', any(
+            getattr(cls, name, None) is not method
+            for name, method in zip(METRIC_METHODS, root._metric_methods)
+        ))
+
+    def _rebuild_kernels(cls) -> None:
+        """Rebuild the kernels of the class and its subclasses."""
+        cls._build()
+        for subclass in type.__subclasses__(cls):
+            subclass._rebuild_kernels()
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if (name.isupper() and name not in ('PARAMETERS', 'KERNEL')
+                or name in METRIC_METHODS):
+            cls._rebuild_kernels()
+
+    def __delattr__(cls, name: str) -> None:
+        super().__delattr__(name)
+        if name.isupper() or name in METRIC_METHODS:
+            cls._rebuild_kernels()
+
+
+class Training(metaclass=TrainingMeta):
     """
     Base class for description training.
 
@@ -74,6 +264,11 @@ class Training:
         number of meters per kilometer
     MIN_IN_HR
         number of minutes per hour
+    PARAMETERS: tuple[str, ...]
+        names of the constructor parameters in the order of the package,
+        a subclass with another constructor declares its own
+    KERNEL: Kernel
+        formulas of the class specialized with its constants
     action: int
         number of movements per training
     duration: float
@@ -91,8 +286,19 @@ class Training:
         returns the number of calories spent
     show_training_info() -> InfoMessage:
         returns an instance of the class InfoMessage
+    build_kernel(power) -> Kernel
+        returns the formulas of the class specialized with its constants
     """
 
+    # The instance attributes live in slots; the lazily created
+    # ``__dict__`` only keeps per-instance overrides such as mocks.
+    __slots__ = ('action', 'duration', 'weight', '__dict__')
+
+    PARAMETERS: ClassVar[tuple[str, ...]] = ('action', 'duration', 'weight')
+    KERNEL: ClassVar[Kernel]
+    _metric_methods: ClassVar[tuple[Any, ...]]
+    _overrides_metrics: ClassVar[bool]
+
     LEN_STEP: float = 0.65
     M_IN_KM: int = 1000
     MIN_IN_HR: int = 60
@@ -119,28 +325,72 @@ class Training:
         self.duration = duration
         self.weight = weight
 
+    @classmethod
+    def build_kernel(cls, power: Callable[[Any, int], Any] = pow) -> Kernel:
+        """
+        Build the formulas of the class with its constants bound.
+
+        The constants are read once here instead of through the MRO on
+        every call. A subclass that changes a formula overrides this
+        method and extends the kernel of the base class.
+
+        Arguments:
+        power: function raising to a power, ``np.float_power`` for
+        NumPy arrays to match the ``**`` operator on floats
+        """
+        len_step = cls.LEN_STEP
+        m_in_km = cls.M_IN_KM
+
+        def distance(training: Any) -> Any:
+            return training.action * len_step / m_in_km
+
+        def speed(training: Any, distance: Any) -> Any:
+            return distance / training.duration
+
+        return Kernel(distance, speed)
+
     def get_distance(self) -> float:
         """Get the distance in kilometers."""
-        return self.action * self.LEN_STEP / self.M_IN_KM
+        return self.KERNEL.distance(self)
 
     def get_mean_speed(self) -> float:
         """Get the average speed of movement."""
-        return self.get_distance() / self.duration
+        return self.KERNEL.speed(self, self.get_distance())
 
     def get_spent_calories(self) -> float:
         """Get the number of calories consumed."""
-        raise NotImplementedError(
-            'Method "get_spent_calories" in class '
-            f'"{type(self).__name__}" not defined')
+        calories = self.KERNEL.calories
+        if calories is None:
+            raise NotImplementedError(
+                'Method "get_spent_calories" in class '
+                f'"{type(self).__name__}" not defined')
+        return calories(self, self.get_mean_speed())
 
     def show_training_info(self) -> InfoMessage:
-        """Return an informational message about the completed training."""
+        """
+        Return an informational message about the completed training.
+
+        The distance is passed to the speed formula and the speed to the
+        calorie formula, so every formula runs once per message without
+        caching anything on the instance. A class overriding a metric
+        method, or without a calorie formula, is shown through its
+        methods.
+        """
+        kernel = self.KERNEL
+        if self._overrides_metrics or kernel.calories is None:
+            distance = self.get_distance()
+            speed = self.get_mean_speed()
+            calories = self.get_spent_calories()
+        else:
+            distance = kernel.distance(self)
+            speed = kernel.speed(self, distance)
+            calories = kernel.calories(self, speed)
         return InfoMessage(
             self.__class__.__name__,
             self.duration,
-            self.get_distance(),
-            self.get_mean_speed(),
-            self.get_spent_calories()
+            distance,
+            speed,
+            calories
         )
 
 
@@ -163,16 +413,27 @@ class Running(Training):
         redefined method of the base class
     """
 
+    __slots__ = ()
+
     RATIO_SPEED: int = 18
     RATIO_SPEED_SHIFT: float = 1.79
 
-    def get_spent_calories(self) -> float:
-        """Get the number of calories consumed."""
-        return (
-            (self.RATIO_SPEED * self.get_mean_speed()
-             + self.RATIO_SPEED_SHIFT) * self.weight
-            / self.M_IN_KM * (self.duration * self.MIN_IN_HR)
-        )
+    @classmethod
+    def build_kernel(cls, power: Callable[[Any, int], Any] = pow) -> Kernel:
+        """Add the calorie formula of running to the base kernel."""
+        kernel = super().build_kernel(power)
+        m_in_km = cls.M_IN_KM
+        min_in_hr = cls.MIN_IN_HR
+        ratio_speed = cls.RATIO_SPEED
+        ratio_speed_shift = cls.RATIO_SPEED_SHIFT
+
+        def calories(training: Any, speed: Any) -> Any:
+            return (
+                (ratio_speed * speed + ratio_speed_shift) * training.weight
+                / m_in_km * (training.duration * min_in_hr)
+            )
+
+        return kernel._replace(calories=calories)
 
 
 class SportsWalking(Training):
@@ -207,6 +468,10 @@ class SportsWalking(Training):
         redefined method of the base class
     """
 
+    __slots__ = ('height',)
+
+    PARAMETERS = ('action', 'duration', 'weight', 'height')
+
     RATIO_WEIGHT_USER: float = 0.035
     RATIO_WEIGHT_SPEED_USER: float = 0.029
     KMH_IN_MSEC: float = 0.278
@@ -236,14 +501,28 @@ class SportsWalking(Training):
         super().__init__(action, duration, weight)
         self.height = height
 
-    def get_spent_calories(self):
-        """Get the number of calories consumed."""
-        return (
-            (self.RATIO_WEIGHT_USER * self.weight + (((self.get_mean_speed()
-             * self.KMH_IN_MSEC)**2) / (self.height / self.CM_IN_M))
-             * self.RATIO_WEIGHT_SPEED_USER * self.weight)
-            * (self.duration * self.MIN_IN_HR)
-        )
+    @classmethod
+    def build_kernel(cls, power: Callable[[Any, int], Any] = pow) -> Kernel:
+        """Add the calorie formula of sports walking to the base kernel."""
+        kernel = super().build_kernel(power)
+        min_in_hr = cls.MIN_IN_HR
+        ratio_weight_user = cls.RATIO_WEIGHT_USER
+        ratio_weight_speed_user = cls.RATIO_WEIGHT_SPEED_USER
+        kmh_in_msec = cls.KMH_IN_MSEC
+        cm_in_m = cls.CM_IN_M
+
+        def calories(training: Any, speed: Any) -> Any:
+            duration = training.duration
+            weight = training.weight
+            return (
+                (ratio_weight_user * weight
+                 + (power(speed * kmh_in_msec, 2)
+                    / (training.height / cm_in_m))
+                 * ratio_weight_speed_user * weight)
+                * (duration * min_in_hr)
+            )
+
+        return kernel._replace(calories=calories)
 
 
 class Swimming(Training):
@@ -280,6 +559,11 @@ class Swimming(Training):
         redefined method of the base class
     """
 
+    __slots__ = ('length_pool', 'count_pool')
+
+    PARAMETERS = ('action', 'duration', 'weight', 'length_pool',
+                  'count_pool')
+
     LEN_STEP: float = 1.38
     SHIFT_MEAN_SPEED: float = 1.1
     FACTOR: int = 2
@@ -312,21 +596,201 @@ class Swimming(Training):
         self.length_pool = length_pool
         self.count_pool = count_pool
 
-    def get_mean_speed(self) -> float:
-        """Get the average swimming speed."""
-        return (
-            self.length_pool * self.count_pool
-            / self.M_IN_KM / self.duration
-        )
+    @classmethod
+    def build_kernel(cls, power: Callable[[Any, int], Any] = pow) -> Kernel:
+        """Replace the speed and add the calorie formula of swimming."""
+        kernel = super().build_kernel(power)
+        m_in_km = cls.M_IN_KM
+        shift_mean_speed = cls.SHIFT_MEAN_SPEED
+        factor = cls.FACTOR
 
-    def get_spent_calories(self) -> float:
-        """Get the number of calories consumed."""
+        def speed(training: Any, distance: Any) -> Any:
+            return (
+                training.length_pool * training.count_pool / m_in_km
+                / training.duration
+            )
+
+        def calories(training: Any, speed: Any) -> Any:
+            return (
+                (speed + shift_mean_speed)
+                * factor * training.weight * training.duration
+            )
+
+        return kernel._replace(speed=speed, calories=calories)
+
+
+class PackageError(Exception):
+    """Base class for errors in packages received from sensors."""
+
+
+class UnknownWorkoutTypeError(PackageError, KeyError):
+    """
+    The training code designation is not registered.
+
+    ...
+
+    Attributes
+    ----------
+    workout_type: str
+        training code designation from the package
+    """
+
+    def __init__(self, workout_type: str) -> None:
+        super().__init__(workout_type)
+        self.workout_type = workout_type
+
+    def __str__(self) -> str:
+        return f'Unknown training code "{self.workout_type}"'
+
+
+class PackageSizeError(PackageError, TypeError):
+    """
+    The package has a wrong number of values for its training type.
+
+    ...
+
+    Attributes
+    ----------
+    workout_type: str
+        training code designation from the package
+    expected: int
+        number of values the training type requires
+    received: int
+        number of values in the package
+    """
+
+    def __init__(self, workout_type: str, expected: int, received: int
+                 ) -> None:
+        super().__init__(workout_type, expected, received)
+        self.workout_type = workout_type
+        self.expected = expected
+        self.received = received
+
+    def __str__(self) -> str:
         return (
-            (self.get_mean_speed() + self.SHIFT_MEAN_SPEED)
-            * self.FACTOR * self.weight * self.duration
+            f'Package "{self.workout_type}" expects {self.expected} '
+            f'values, got {self.received}'
         )
 
 
+class WorkoutType(NamedTuple):
+    """
+    Registered training type.
+
+    ...
+
+    Attributes
+    ----------
+    training: type[Training]
+        class of the training
+    fields: tuple[str, ...]
+        names of the constructor parameters in the order of the package
+    formula: Optional[Callable]
+        vectorized formula used by ``batch.compute_batch``, if any
+    """
+
+    training: type[Training]
+    fields: tuple[str, ...]
+    formula: Optional[Callable] = None
+
+
+PLUGIN_GROUP: str = 'simple_fitness_tracker.workouts'
+
+WORKOUT_TYPES: dict[str, WorkoutType] = {}
+
+_searched_plugins: set[str] = set()
+
+
+def register_workout(workout_type: str,
+                     training: Optional[type[Training]] = None,
+                     formula: Optional[Callable] = None):
+    """
+    Register a training class under a code designation.
+
+    Can be used as a class decorator:
+
+        @register_workout('CYC', formula=cycling_formula)
+        class Cycling(Training):
+            ...
+
+    Arguments:
+    workout_type: training code designation
+    training: subclass of Training, omitted when used as a decorator
+    formula: vectorized formula with the signature of the formulas
+    in the ``batch`` module
+
+    Returns:
+    the decorator if training is omitted, otherwise None
+    """
+    if training is None:
+        def decorator(cls: type[Training]) -> type[Training]:
+            register_workout(workout_type, cls, formula)
+            return cls
+        return decorator
+    WORKOUT_TYPES[workout_type] = WorkoutType(
+        training, training.PARAMETERS, formula
+    )
+    return None
+
+
+def load_plugin(workout_type: str) -> None:
+    """
+    Discover a training type in the installed plugins.
+
+    Entry points of the group PLUGIN_GROUP named after the code are
+    loaded. An entry point may refer to a subclass of Training, which is
+    registered under its name, or to a module that registers its types
+    with register_workout on import. Every code is searched only once.
+    """
+    if workout_type in _searched_plugins:
+        return
+    _searched_plugins.add(workout_type)
+    from importlib.metadata import entry_points
+    for entry_point in entry_points(group=PLUGIN_GROUP, name=workout_type):
+        plugin = entry_point.load()
+        if (workout_type not in WORKOUT_TYPES
+                and isinstance(plugin, type)
+                and issubclass(plugin, Training)):
+            register_workout(workout_type, plugin)
+
+
+def get_workout(workout_type: str) -> WorkoutType:
+    """
+    Return a registered training type, discovering plugins on demand.
+
+    Raises:
+    UnknownWorkoutTypeError: neither registered nor provided by a plugin
+    """
+    try:
+        return WORKOUT_TYPES[workout_type]
+    except KeyError:
+        load_plugin(workout_type)
+    try:
+        return WORKOUT_TYPES[workout_type]
+    except KeyError:
+        raise UnknownWorkoutTypeError(workout_type) from None
+
+
+def check_package(workout_type: str, data: Sequence[float]) -> WorkoutType:
+    """
+    Return the training type of a package after checking its arity.
+
+    Raises:
+    UnknownWorkoutTypeError: the code is neither registered
+    nor provided by a plugin
+    PackageSizeError: wrong number of values in data
+    """
+    workout = WORKOUT_TYPES.get(workout_type) or get_workout(workout_type)
+    if len(data) != len(workout.fields):
+        raise PackageSizeError(workout_type, len(workout.fields), len(data))
+    return workout
+
+
+register_workout('SWM', Swimming)
+register_workout('RUN', Running)
+register_workout('WLK', SportsWalking)
+
+
 def read_package(workout_type: str, data: list[int]) -> Union[Running,
                                                               Swimming,
                                                               SportsWalking,
@@ -334,30 +798,19 @@ def read_package(workout_type: str, data: list[int]) -> Union[Running,
     """
     Simulation of receiving data from sensors.
 
-    LocalVariable:
-    types_training: dict that stores code designations and class references
-
     Arguments:
     workout_type: training code designation
     data: list with training data
 
     Raises:
-    KeyError: checking for the presence of a key in the dictionary
+    UnknownWorkoutTypeError: the code is neither registered
+    nor provided by a plugin
+    PackageSizeError: wrong number of values in data
 
     Returns:
     instance of the class
     """
-    types_training: dict[
-        str, type[Training]
-    ] = {
-        'SWM': Swimming,
-        'RUN': Running,
-        'WLK': SportsWalking
-    }
-    try:
-        return types_training[workout_type](*data)
-    except KeyError:
-        raise KeyError
+    return check_package(workout_type, data).training(*data)
 
 
 def main(training: Union[Running, Swimming, SportsWalking, Training]) -> None:
@@ -377,7 +830,39 @@ def main(training: Union[Running, Swimming, SportsWalking, Training]) -> None:
     print(info.get_message())
 
 
+COMMANDS: dict[str, tuple[str, str]] = {
+    'process': ('pipeline', 'run'),
+    'serve': ('server', 'main'),
+}
+
+
+def run_command(argv: list[str]) -> int:
+    """
+    Run a command line tool: python -m homework COMMAND [ARGS].
+
+    The module of the command is imported only when it is run, so
+    starting one tool does not pay for the imports of the others.
+
+    Arguments:
+    argv: name of the command followed by its arguments
+
+    Returns:
+    exit status
+    """
+    command, *args = argv
+    if command not in COMMANDS:
+        print(f'usage: python -m homework [{"|".join(COMMANDS)}] ...',
+              file=sys.stderr)
+        return 2
+    from importlib import import_module
+    module, function = COMMANDS[command]
+    return getattr(import_module(module), function)(args) or 0
+
+
 if __name__ == '__main__':
+    if sys.argv[1:]:
+        sys.exit(run_command(sys.argv[1:]))
+
     packages = [
         ('SWM', [720, 1, 80, 25, 40]),
         ('RUN', [15000, 1, 75]),
@@ -0,0 +1,257 @@
+"""
+Binary columnar file format for sensor packages.
+
+Layout, little-endian, every section aligned to 8 bytes:
+
+    header      magic b'WKPK', version u16, code count u16,
+                column count u16, 2 pad bytes, row count u64
+    code table  per training code: length u8, ASCII code
+    columns     per column: length u8, ASCII name, array typecode
+    type codes  u8 index into the code table per row
+    data        per column: one int64 ('q') or float64 ('d') per row
+
+Columns hold the constructor parameters of all training types; rows
+of a type without a parameter store 0. A column is written as int64
+when all its values are integers, so packages read back unchanged.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from homework import check_package, get_workout
+
+if TYPE_CHECKING:
+    from batch import BatchResult
+
+MAGIC: bytes = b'WKPK'
+VERSION: int = 1
+HEADER = struct.Struct('<4sHHH2xQ')
+ALIGNMENT: int = 8
+
+Package = tuple[str, list[float]]
+
+
+def _padding(offset: int) -> int:
+    """Return the number of bytes up to the next aligned offset."""
+    return -offset % ALIGNMENT
+
+
+def _name_table(names: Iterable[str]) -> bytes:
+    """Encode names as length-prefixed ASCII strings."""
+    table = bytearray()
+    for name in names:
+        encoded = name.encode('ascii')
+        table.append(len(encoded))
+        table += encoded
+    return bytes(table)
+
+
+def write_packages(path: str, packages: Iterable[Package]) -> int:
+    """
+    Write packages to a file in the binary columnar format.
+
+    Arguments:
+    path: name of the file to create
+    packages: pairs of training code designation and training data
+
+    Raises:
+    UnknownWorkoutTypeError: unknown training code
+    PackageSizeError: wrong number of values in a package
+    ValueError: more than 256 different training codes
+
+    Returns:
+    number of written packages
+    """
+    codes: dict[str, int] = {}
+    type_codes = array('B')
+    values: dict[str, array] = {}
+    integral: dict[str, bool] = {}
+    for row, (workout_type, data) in enumerate(packages):
+        fields = check_package(workout_type, data).fields
+        code = codes.setdefault(workout_type, len(codes))
+        if code > 255:
+            raise ValueError('At most 256 training codes per file')
+        type_codes.append(code)
+        package = dict(zip(fields, data))
+        for name, value in package.items():
+            if name not in values:
+                values[name] = array('d', [0]) * row
+                integral[name] = True
+            integral[name] = integral[name] and isinstance(value, int)
+        for name, column in values.items():
+            column.append(package.get(name, 0))
+    columns = {
+        name: array('q', map(int, column)) if integral[name] else column
+        for name, column in values.items()
+    }
+    header = HEADER.pack(
+        MAGIC, VERSION, len(codes), len(columns), len(type_codes)
+    )
+    tables = _name_table(codes) + b''.join(
+        _name_table([name]) + column.typecode.encode('ascii')
+        for name, column in columns.items()
+    )
+    with open(path, 'wb') as file:
+        file.write(header + tables + bytes(_padding(len(header + tables))))
+        file.write(type_codes.tobytes())
+        file.write(bytes(_padding(len(type_codes))))
+        for column in columns.values():
+            if sys.byteorder != 'little':
+                column.byteswap()
+            file.write(column.tobytes())
+    return len(type_codes)
+
+
+class PackageFile:
+    """
+    Memory-mapped reader of the binary columnar format.
+
+    Columns are exposed as memoryviews over the mapped file without
+    copying; wrap them with ``numpy.frombuffer`` to use them as arrays.
+    All views must be released before the file is closed.
+
+    ...
+
+    Attributes
+    ----------
+    codes: tuple[str, ...]
+        training codes referenced by the type code column
+    type_codes: memoryview
+        index into codes for every row
+    columns: dict[str, memoryview]
+        values of every constructor parameter
+
+    Methods
+    -------
+    workout_types() -> Iterator[str]
+        yields the training code of every row
+    compute_batch() -> BatchResult
+        calculates the metrics of all rows with the batch engine
+    close() -> None
+        releases the mapping
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Maps the file into memory and parses the header.
+
+
+        Parameters
+        ----------
+        path: str
+            name of the file in the binary columnar format
+        """
+        if sys.byteorder != 'little':
+            raise NotImplementedError('Big-endian hosts are not supported')
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        """
+        Read the tables and create the views of the columns.
+
+        Raises:
+        ValueError: the file is not a package file, is truncated
+        or corrupted
+        """
+        self._check(HEADER.size)
+        magic, version, code_count, column_count, rows = (
+            HEADER.unpack_from(self._buffer)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Not a package file of a supported version')
+        offset = HEADER.size
+        codes = []
+        for _ in range(code_count):
+            code, offset = self._read_name(offset)
+            codes.append(code)
+        layout = []
+        for _ in range(column_count):
+            name, offset = self._read_name(offset)
+            self._check(offset + 1)
+            typecode = chr(self._buffer[offset])
+            if typecode not in ('q', 'd'):
+                raise ValueError(f'Unknown typecode of column "{name}"')
+            layout.append((name, typecode))
+            offset += 1
+        offset += _padding(offset)
+        self._check(
+            offset + rows + _padding(rows) + len(layout) * rows * ALIGNMENT
+        )
+        self.codes = tuple(codes)
+        self.type_codes = self._buffer[offset:offset + rows]
+        offset += rows + _padding(rows)
+        self.columns: dict[str, memoryview] = {}
+        for name, typecode in layout:
+            size = rows * ALIGNMENT
+            self.columns[name] = (
+                self._buffer[offset:offset + size].cast(typecode)
+            )
+            offset += size
+        if offset != len(self._buffer):
+            raise ValueError('Package file is truncated or corrupted')
+
+    def _check(self, end: int) -> None:
+        """Raise ValueError if the file ends before the offset."""
+        if end > len(self._buffer):
+            raise ValueError('Package file is truncated or corrupted')
+
+    def _read_name(self, offset: int) -> tuple[str, int]:
+        """Read a length-prefixed name, return it and the next offset."""
+        self._check(offset + 1)
+        end = offset + 1 + self._buffer[offset]
+        self._check(end)
+        try:
+            return bytes(self._buffer[offset + 1:end]).decode('ascii'), end
+        except UnicodeDecodeError:
+            raise ValueError('Package file is corrupted') from None
+
+    def __len__(self) -> int:
+        return len(self.type_codes)
+
+    def workout_types(self) -> Iterator[str]:
+        """Yield the training code designation of every row."""
+        codes = self.codes
+        for index in self.type_codes:
+            yield codes[index]
+
+    def __iter__(self) -> Iterator[Package]:
+        """Yield the packages in the order they were written."""
+        fields = {code: get_workout(code).fields for code in self.codes}
+        for row, workout_type in enumerate(self.workout_types()):
+            yield workout_type, [
+                self.columns[name][row] for name in fields[workout_type]
+            ]
+
+    def compute_batch(self) -> 'BatchResult':
+        """Calculate the metrics of all rows with ``batch.compute_batch``."""
+        import numpy as np
+
+        from batch import compute_batch
+        workout_types = np.array(self.codes)[
+            np.frombuffer(self.type_codes, dtype=np.uint8)
+        ]
+        return compute_batch(workout_types, self.columns)
+
+    def close(self) -> None:
+        """Release the views and the mapping of the file."""
+        for view in getattr(self, 'columns', {}).values():
+            view.release()
+        if hasattr(self, 'type_codes'):
+            self.type_codes.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'PackageFile':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
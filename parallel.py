@@ -0,0 +1,143 @@
+"""
+Batch computation over contiguous buffers on a thread pool.
+
+Columns of one training type are taken as float64 buffers, e.g. NumPy
+arrays, ``array('d')`` or memoryviews, without copying, and split into
+blocks of rows. Every block is computed with the NumPy kernels of
+``batch`` whose inner loops release the GIL, so blocks computed on a
+``ThreadPoolExecutor`` run in parallel with each other and with the
+other threads of the process. The columns are checked against the
+limits of ``validate`` before any block is computed.
+"""
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+import numpy as np
+
+from batch import BatchResult, Formula, get_formula, inside_limits, row_error
+from homework import Training
+from validate import Validator
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+DEFAULT_BLOCK_SIZE: int = 65536
+
+Ranges = list[tuple[int, int]]
+
+
+def as_column(buffer: Any) -> np.ndarray:
+    """Return a float64 array sharing memory with the buffer if possible."""
+    return np.ascontiguousarray(buffer, dtype=np.float64)
+
+
+def _prepare(workout_type: str,
+             columns: Mapping[str, Any],
+             block_size: int,
+             validator: Optional[Validator]
+             ) -> tuple[type[Training], Formula, dict[str, np.ndarray],
+                        BatchResult, Ranges]:
+    """Validate the columns and allocate the result of a computation."""
+    if block_size < 1:
+        raise ValueError(f'Block size must be positive, got {block_size}')
+    cls, formula = get_formula(workout_type)
+    arrays = {name: as_column(columns[name]) for name in cls.PARAMETERS}
+    sizes = {len(array) for array in arrays.values()}
+    if len(sizes) > 1:
+        raise ValueError(
+            f'Columns of "{workout_type}" differ in length: {sorted(sizes)}'
+        )
+    size = sizes.pop()
+    validator = validator or Validator()
+    inside = inside_limits(arrays, size, validator)
+    if not inside.all():
+        row = int(np.flatnonzero(~inside)[0])
+        raise ValueError(
+            f'Row {row} of "{workout_type}" is invalid: '
+            + row_error(workout_type, arrays, row, validator)
+        )
+    result = BatchResult(np.empty(size), np.empty(size), np.empty(size))
+    ranges = [
+        (start, min(start + block_size, size))
+        for start in range(0, size, block_size)
+    ]
+    return cls, formula, arrays, result, ranges
+
+
+def compute_rows(cls: type[Training],
+                 formula: Formula,
+                 arrays: Mapping[str, np.ndarray],
+                 result: BatchResult,
+                 start: int,
+                 stop: int) -> None:
+    """Compute the rows from start to stop into the result arrays."""
+    subset = {name: array[start:stop] for name, array in arrays.items()}
+    (result.distance[start:stop],
+     result.speed[start:stop],
+     result.calories[start:stop]) = formula(cls, subset)
+
+
+def compute_buffers(workout_type: str,
+                    columns: Mapping[str, Any],
+                    executor: Optional['Executor'] = None,
+                    block_size: int = DEFAULT_BLOCK_SIZE,
+                    validator: Optional[Validator] = None) -> BatchResult:
+    """
+    Calculate the metrics of trainings of one type given as buffers.
+
+    Arguments:
+    workout_type: training code designation of all rows
+    columns: buffer of every constructor parameter, one value per row
+    executor: thread pool computing the blocks, the calling thread
+    computes them if omitted
+    block_size: number of rows computed at once
+    validator: limits to check against, validate.LIMITS by default
+
+    Raises:
+    UnknownWorkoutTypeError: the code is not registered
+    KeyError: a column required by the training type is missing
+    ValueError: the columns differ in length or a row is out of the
+    limits, e.g. a zero duration
+
+    Returns:
+    BatchResult with float64 arrays in the order of the rows
+    """
+    cls, formula, arrays, result, ranges = _prepare(
+        workout_type, columns, block_size, validator
+    )
+    if executor is None or len(ranges) < 2:
+        for start, stop in ranges:
+            compute_rows(cls, formula, arrays, result, start, stop)
+        return result
+    futures = [
+        executor.submit(compute_rows, cls, formula, arrays, result,
+                        start, stop)
+        for start, stop in ranges
+    ]
+    for future in futures:
+        future.result()
+    return result
+
+
+async def compute_buffers_async(workout_type: str,
+                                columns: Mapping[str, Any],
+                                executor: Optional['Executor'] = None,
+                                block_size: int = DEFAULT_BLOCK_SIZE,
+                                validator: Optional[Validator] = None
+                                ) -> BatchResult:
+    """
+    Calculate the metrics like compute_buffers without blocking the loop.
+
+    The blocks are submitted to the executor, the default one of the
+    event loop if omitted, and awaited together.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    cls, formula, arrays, result, ranges = _prepare(
+        workout_type, columns, block_size, validator
+    )
+    await asyncio.gather(*(
+        loop.run_in_executor(executor, compute_rows, cls, formula, arrays,
+                             result, start, stop)
+        for start, stop in ranges
+    ))
+    return result
@@ -0,0 +1,331 @@
+"""
+Streaming processing of sensor packages.
+
+Packages are read lazily from newline-delimited dumps, one JSON array
+``["SWM", [720, 1, 80, 25, 40]]`` per line, so memory stays flat
+regardless of the size of the input. Malformed lines and packages
+rejected by ``validate`` are skipped and reported with their line
+number instead of stopping the run.
+
+Usage:
+python -m pipeline [--chunk-size N] [--workers N] [--shared-memory]
+                   [--output FILE] [--rejected FILE] [INPUT]
+"""
+import argparse
+import json
+import sys
+from array import array
+from collections import deque
+from itertools import islice
+from typing import (TYPE_CHECKING, Iterable, Iterator, Optional, TextIO,
+                    TypeVar)
+
+from homework import InfoMessage, format_messages, read_package
+from validate import (Rejection, filter_numbered_packages, filter_packages,
+                      shape_reason)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+T = TypeVar('T')
+
+Package = tuple[str, list[float]]
+
+DEFAULT_CHUNK_SIZE: int = 1024
+
+
+def parse_package(line: str) -> Package:
+    """
+    Parse one line of a dump into a package.
+
+    Arguments:
+    line: JSON array with the training code and the list of training data
+
+    Raises:
+    ValueError: the line is not a valid package
+
+    Returns:
+    tuple of training code designation and training data
+    """
+    try:
+        workout_type, data = json.loads(line)
+    except (TypeError, ValueError) as error:
+        raise ValueError(f'Malformed package: {line.strip()!r}') from error
+    return workout_type, data
+
+
+def iter_packages(stream: Iterable[str]) -> Iterator[Package]:
+    """Lazily yield packages from the lines of a stream, skipping blanks."""
+    for line in stream:
+        if line.strip():
+            yield parse_package(line)
+
+
+def iter_numbered_packages(stream: Iterable[str],
+                           rejected: Optional[list[Rejection]] = None,
+                           start: int = 0) -> Iterator[tuple[int, Package]]:
+    """
+    Lazily yield packages with their line numbers, skipping blanks.
+
+    Malformed lines, including packages whose training code is not a
+    string or whose data is not a list, are reported instead of raising.
+
+    Arguments:
+    stream: lines of a dump
+    rejected: list receiving a Rejection for every malformed line, the
+    rejections are discarded if None
+    start: number of the first line
+    """
+    loads = json.loads
+    for index, line in enumerate(stream, start):
+        # Blank lines fail to parse too, so valid lines are parsed
+        # without stripping them first.
+        try:
+            workout_type, data = loads(line)
+        except (TypeError, ValueError):
+            if line.strip() and rejected is not None:
+                rejected.append(Rejection(
+                    index, '', f'Malformed package: {line.strip()!r}'
+                ))
+            continue
+        if not (isinstance(workout_type, str) and isinstance(data, list)):
+            if rejected is not None:
+                rejected.append(Rejection(
+                    index,
+                    workout_type if isinstance(workout_type, str) else '',
+                    str(shape_reason(workout_type, data))
+                ))
+            continue
+        yield index, (workout_type, data)
+
+
+def _messages(packages: Iterable[Package]) -> Iterator[InfoMessage]:
+    """Yield an informational message for every valid package."""
+    for workout_type, data in packages:
+        yield read_package(workout_type, data).show_training_info()
+
+
+def iter_messages(packages: Iterable[Package],
+                  rejected: Optional[list[Rejection]] = None
+                  ) -> Iterator[InfoMessage]:
+    """
+    Yield an informational message for every valid package.
+
+    Arguments:
+    packages: (workout_type, data) packages
+    rejected: list receiving a Rejection for every invalid package,
+    invalid packages are skipped silently if omitted
+    """
+    return _messages(filter_packages(packages, rejected))
+
+
+def stream_messages(stream: Iterable[str],
+                    rejected: Optional[list[Rejection]] = None,
+                    start: int = 0) -> Iterator[InfoMessage]:
+    """
+    Yield an informational message for every valid package of a dump.
+
+    Arguments:
+    stream: lines of a dump
+    rejected: list receiving a Rejection, with the line number, for
+    every malformed line and invalid package, the rejections are
+    discarded if None
+    start: number of the first line
+    """
+    return _messages(filter_numbered_packages(
+        iter_numbered_packages(stream, rejected, start), rejected
+    ))
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Split an iterable into lists of at most ``size`` items."""
+    if size < 1:
+        raise ValueError(f'Chunk size must be positive, got {size}')
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def process_stream(stream: Iterable[str],
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   rejected: Optional[list[Rejection]] = None
+                   ) -> Iterator[list[InfoMessage]]:
+    """
+    Process a dump of packages chunk by chunk.
+
+    Arguments:
+    stream: lines of a dump, e.g. an open file or sys.stdin
+    chunk_size: number of messages per chunk
+    rejected: list receiving a Rejection for every malformed line and
+    invalid package, they are skipped silently if omitted
+
+    Returns:
+    iterator over lists of InfoMessage in input order
+    """
+    return chunked(stream_messages(stream, rejected), chunk_size)
+
+
+def compute_chunk(lines: list[str], start: int = 0
+                  ) -> tuple[list[str], array, list[Rejection]]:
+    """
+    Process a chunk of dump lines in a worker process.
+
+    The result is sent back in a compact form: training types and an
+    array of doubles with duration, distance, speed and calories of
+    every message, which pickles as raw bytes, followed by the report
+    of the rejected lines numbered from start.
+    """
+    types = []
+    values = array('d')
+    rejected: list[Rejection] = []
+    for info in stream_messages(lines, rejected, start):
+        types.append(info.training_type)
+        values.extend(
+            (info.duration, info.distance, info.speed, info.calories)
+        )
+    return types, values, rejected
+
+
+def decode_chunk(types: list[str], values: array) -> list[InfoMessage]:
+    """Restore messages from the result of ``compute_chunk``."""
+    return [
+        InfoMessage(training_type, *values[index * 4:index * 4 + 4])
+        for index, training_type in enumerate(types)
+    ]
+
+
+def process_stream_parallel(stream: Iterable[str],
+                            workers: int,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE,
+                            rejected: Optional[list[Rejection]] = None
+                            ) -> Iterator[list[InfoMessage]]:
+    """
+    Process a dump of packages on a pool of worker processes.
+
+    At most two chunks per worker are in flight, so memory stays
+    bounded, and chunks are yielded in input order.
+
+    Arguments:
+    stream: lines of a dump, e.g. an open file or sys.stdin
+    workers: number of worker processes
+    chunk_size: number of packages per chunk sent to a worker
+    rejected: list receiving a Rejection for every malformed line and
+    invalid package, in input order as the chunks are yielded
+
+    Returns:
+    iterator over lists of InfoMessage in input order
+    """
+    if workers <= 1:
+        yield from process_stream(stream, chunk_size, rejected)
+        return
+    # Importing the process pool costs more than the serial path needs.
+    from concurrent.futures import ProcessPoolExecutor
+    pending: deque['Future'] = deque()
+
+    def collect() -> list[InfoMessage]:
+        types, values, report = pending.popleft().result()
+        if rejected is not None:
+            rejected.extend(report)
+        return decode_chunk(types, values)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for number, lines in enumerate(chunked(stream, chunk_size)):
+            pending.append(executor.submit(
+                compute_chunk, lines, number * chunk_size
+            ))
+            if len(pending) >= workers * 2:
+                yield collect()
+        while pending:
+            yield collect()
+
+
+def write_rejections(rejected: Iterable[Rejection], report: TextIO) -> None:
+    """Write rejections as JSON objects, one per line."""
+    report.write(''.join(
+        json.dumps(rejection._asdict(), ensure_ascii=False) + '\n'
+        for rejection in rejected
+    ))
+
+
+def write_messages(chunks: Iterable[Iterable[InfoMessage]],
+                   output: TextIO,
+                   rejected: Optional[list[Rejection]] = None,
+                   report: Optional[TextIO] = None) -> int:
+    """
+    Write messages to the output as soon as each chunk is ready.
+
+    Arguments:
+    chunks: messages in chunks
+    output: text buffer or file opened for writing
+    rejected: list the chunks report the rejected packages to; it is
+    written to report and emptied after every chunk
+    report: text file for the rejections, sys.stderr by default
+
+    Returns:
+    number of written messages
+    """
+    count = 0
+    for chunk in chunks:
+        count += format_messages(chunk, output)
+        output.flush()
+        if rejected:
+            write_rejections(rejected, report or sys.stderr)
+            rejected.clear()
+    if rejected:
+        write_rejections(rejected, report or sys.stderr)
+        rejected.clear()
+    return count
+
+
+def run(argv: list[str] | None = None) -> int:
+    """Command line entry point, returns the exit status."""
+    parser = argparse.ArgumentParser(
+        prog='python -m pipeline',
+        description='Process a newline-delimited dump of sensor packages.'
+    )
+    parser.add_argument(
+        'input', nargs='?', type=argparse.FileType('r', encoding='utf-8'),
+        default=sys.stdin, help='dump file, stdin by default'
+    )
+    parser.add_argument(
+        '-o', '--output', type=argparse.FileType('w', encoding='utf-8'),
+        default=sys.stdout, help='output file, stdout by default'
+    )
+    parser.add_argument(
+        '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+        help='number of messages written at once'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='number of worker processes'
+    )
+    parser.add_argument(
+        '--shared-memory', action='store_true',
+        help='return the results of the workers through shared memory'
+    )
+    parser.add_argument(
+        '--rejected', type=argparse.FileType('w', encoding='utf-8'),
+        default=sys.stderr,
+        help='JSONL report of the rejected lines, stderr by default'
+    )
+    args = parser.parse_args(argv)
+    rejected: list[Rejection] = []
+    chunks: Iterable[Iterable[InfoMessage]]
+    if args.shared_memory and args.workers > 1:
+        from sharedmem import process_stream_shared
+        chunks = process_stream_shared(args.input, args.workers,
+                                       args.chunk_size, rejected)
+    else:
+        chunks = process_stream_parallel(args.input, args.workers,
+                                         args.chunk_size, rejected)
+    try:
+        write_messages(chunks, args.output, rejected, args.rejected)
+    finally:
+        for stream in (args.input, args.output, args.rejected):
+            if stream not in (sys.stdin, sys.stdout, sys.stderr):
+                stream.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
@@ -0,0 +1,187 @@
+"""
+Opt-in instrumentation of the hot paths.
+
+``enable`` wraps ``read_package``, ``Training.show_training_info`` and
+``InfoMessage.get_message`` to count calls, cumulative time and the
+net number of memory blocks allocated per training type. Calls that
+raise are counted too, under the training code of the package when
+no training was created; ``disable``
+puts the original functions back, so instrumentation costs nothing
+while it is off.
+
+Usage:
+with instrumented():
+    run_the_ingest()
+print(snapshot_text())
+"""
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+from typing import Any, Callable, Iterator
+
+import homework
+
+
+@dataclass
+class CallStats:
+    """
+    Statistics of the calls of one hook for one training type.
+
+    ...
+
+    Attributes
+    ----------
+    calls: int
+        number of calls
+    seconds: float
+        cumulative wall-clock time of the calls
+    blocks: int
+        net number of memory blocks allocated by the calls
+    """
+
+    calls: int = 0
+    seconds: float = 0.0
+    blocks: int = 0
+
+
+_stats: dict[tuple[str, str], CallStats] = {}
+_originals: dict[str, Any] = {}
+
+
+def _record(hook: str, training_type: str, seconds: float,
+            blocks: int) -> None:
+    """Add one call to the statistics."""
+    entry = _stats.get((hook, training_type))
+    if entry is None:
+        entry = _stats[(hook, training_type)] = CallStats()
+    entry.calls += 1
+    entry.seconds += seconds
+    entry.blocks += blocks
+
+
+def _instrument(hook: str, func: Callable,
+                training_type: Callable[..., str]) -> Callable:
+    """
+    Wrap func to record its calls under the hook.
+
+    training_type receives the result, None if the call raised, and the
+    arguments of the call.
+    """
+    clock = time.perf_counter
+    allocated = sys.getallocatedblocks
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = None
+        blocks = allocated()
+        start = clock()
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            seconds = clock() - start
+            try:
+                label = training_type(result, *args, **kwargs)
+            except Exception:
+                # The arguments that made the call fail name no type.
+                label = ''
+            _record(hook, label, seconds, allocated() - blocks)
+    return wrapper
+
+
+def _replace_function(original: Callable, replacement: Callable) -> None:
+    """Rebind a module-level function in every module that imported it."""
+    name = original.__name__
+    for module in list(sys.modules.values()):
+        if getattr(module, name, None) is original:
+            setattr(module, name, replacement)
+
+
+def is_enabled() -> bool:
+    """Return True while the hot paths are instrumented."""
+    return bool(_originals)
+
+
+def enable() -> None:
+    """Instrument the hot paths; does nothing if already enabled."""
+    if is_enabled():
+        return
+    _originals['read_package'] = homework.read_package
+    _originals['show_training_info'] = homework.Training.show_training_info
+    _originals['get_message'] = homework.InfoMessage.get_message
+    _replace_function(homework.read_package, _instrument(
+        'read_package', homework.read_package,
+        lambda training, workout_type, data: (
+            str(workout_type) if training is None
+            else type(training).__name__
+        )
+    ))
+    homework.Training.show_training_info = _instrument(
+        'show_training_info', homework.Training.show_training_info,
+        lambda info, training: (
+            type(training).__name__ if info is None else info.training_type
+        )
+    )
+    homework.InfoMessage.get_message = _instrument(
+        'get_message', homework.InfoMessage.get_message,
+        lambda message, info: info.training_type
+    )
+
+
+def disable() -> None:
+    """Restore the original functions; the statistics are kept."""
+    if not is_enabled():
+        return
+    _replace_function(homework.read_package, _originals['read_package'])
+    homework.Training.show_training_info = _originals['show_training_info']
+    homework.InfoMessage.get_message = _originals['get_message']
+    _originals.clear()
+
+
+def reset() -> None:
+    """Forget the collected statistics."""
+    _stats.clear()
+
+
+@contextmanager
+def instrumented() -> Iterator[None]:
+    """Instrument the hot paths inside the with block."""
+    enable()
+    try:
+        yield
+    finally:
+        disable()
+
+
+def stats() -> dict[tuple[str, str], CallStats]:
+    """Return a copy of the statistics by hook and training type."""
+    return {
+        key: CallStats(**asdict(value)) for key, value in _stats.items()
+    }
+
+
+def snapshot_json() -> str:
+    """Return the statistics as a JSON document."""
+    return json.dumps([
+        {'hook': hook, 'training_type': training_type, **asdict(value)}
+        for (hook, training_type), value in sorted(_stats.items())
+    ], indent=2)
+
+
+def snapshot_text() -> str:
+    """Return the statistics as a text table."""
+    lines = [
+        f'{"hook":<20} {"training type":<15} {"calls":>10} '
+        f'{"seconds":>10} {"us/call":>9} {"blocks":>8}'
+    ]
+    for (hook, training_type), value in sorted(_stats.items()):
+        lines.append(
+            f'{hook:<20} {training_type:<15} {value.calls:>10} '
+            f'{value.seconds:>10.4f} '
+            f'{value.seconds / value.calls * 1e6:>9.2f} '
+            f'{value.blocks:>8}'
+        )
+    return '\n'.join(lines)
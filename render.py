@@ -0,0 +1,277 @@
+"""
+Rendering of training results in several languages, units and formats.
+
+A ``Renderer`` compiles its template once with
+``homework.parse_template``. A batch of results is rendered column by
+column: the displayed names are looked up once per training type, the
+unit conversions multiply whole columns at once, with NumPy when it is
+installed, and only then is every record formatted. Renderers are
+registered by name in RENDERERS:
+
+    ru           the text of InfoMessage.get_message
+    en, de       English and German
+    en-imperial  English with miles and miles per hour
+    json         one JSON object per result, rounded as in the text,
+                 with null for infinite and NaN values;
+                 tabular.write_jsonl exports the full precision
+"""
+import json
+import math
+from itertools import islice, starmap
+from operator import attrgetter
+from typing import Callable, Iterable, Mapping, Optional, Sequence, TextIO
+
+from homework import InfoMessage, all_finite, parse_template
+
+FIELDS: tuple[str, ...] = (
+    'training_type', 'duration', 'distance', 'speed', 'calories'
+)
+
+KM_IN_MILE: float = 1.609344
+
+DEFAULT_CHUNK_SIZE: int = 8192
+
+
+class _Literal(str):
+    """Text that is written as is whatever the format spec of its field."""
+
+    __slots__ = ()
+
+    def __format__(self, spec: str) -> str:
+        return str(self)
+
+
+def scale_column(column: Sequence[float], scale: float) -> list[float]:
+    """
+    Multiply a whole column by a factor.
+
+    NumPy multiplies the column in one call when it is installed, e.g.
+    a memoryview of a ResultTable without copying; the result is the
+    same as of the multiplication of every value in Python.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return [value * scale for value in column]
+    return (np.asarray(column, dtype=float) * scale).tolist()
+
+
+class Renderer:
+    """
+    Compiled template of the text of training results.
+
+    ...
+
+    Attributes
+    ----------
+    template: str
+        str.format template referring to the fields of InfoMessage
+    scales: dict[str, float]
+        factors the values of the fields are multiplied by
+    names: dict[str, str]
+        displayed names of the training types, the name itself if absent
+    escape: Optional[Callable[[str], str]]
+        applied to the displayed names, e.g. json.dumps
+    missing: Optional[str]
+        text of infinite and NaN values, e.g. null in JSON
+
+    Methods
+    -------
+    display_name(training_type) -> str
+        returns the displayed name of a training type
+    render(info) -> str
+        returns the text of a message
+    render_many(messages) -> list[str]
+        returns the texts of a batch of messages
+    render_columns(training_types, columns) -> list[str]
+        returns the texts of results given as columns
+    write(messages, output) -> int
+        writes the texts of the messages, one per line
+    """
+
+    __slots__ = ('template', 'scales', 'names', 'escape', 'missing',
+                 '_format', '_fields', '_displayed')
+
+    def __init__(self,
+                 template: str,
+                 scales: Optional[Mapping[str, float]] = None,
+                 names: Optional[Mapping[str, str]] = None,
+                 escape: Optional[Callable[[str], str]] = None,
+                 missing: Optional[str] = None) -> None:
+        """
+        Compiles the template.
+
+
+        Parameters
+        ----------
+        template: str
+            str.format template referring to the fields of InfoMessage
+        scales: Optional[Mapping[str, float]]
+            factors of the unit conversions by field
+        names: Optional[Mapping[str, str]]
+            displayed names by training type
+        escape: Optional[Callable[[str], str]]
+            applied to the displayed names
+        missing: Optional[str]
+            written instead of infinite and NaN values, whatever the
+            format spec of their field; they are formatted if None
+        """
+        positional, fields = parse_template(template)
+        unknown = set(fields).difference(FIELDS)
+        if unknown:
+            raise ValueError(f'Unknown fields {sorted(unknown)} in template')
+        self.template = template
+        self.scales = dict(scales or {})
+        self.names = dict(names or {})
+        self.escape = escape
+        self.missing = missing
+        self._format = positional.format
+        self._fields = fields
+        self._displayed: dict[str, str] = {}
+
+    def display_name(self, training_type: str) -> str:
+        """Return the displayed name of a training type."""
+        displayed = self._displayed.get(training_type)
+        if displayed is None:
+            displayed = self.names.get(training_type, training_type)
+            if self.escape is not None:
+                displayed = self.escape(displayed)
+            self._displayed[training_type] = displayed
+        return displayed
+
+    def _prepare(self, name: str, column: Sequence) -> Sequence:
+        """Convert a column of values of a field for formatting."""
+        if name == 'training_type':
+            for training_type in set(column).difference(self._displayed):
+                self.display_name(training_type)
+            return list(map(self._displayed.__getitem__, column))
+        if name in self.scales:
+            column = scale_column(column, self.scales[name])
+        if self.missing is not None and not all_finite(column):
+            missing = _Literal(self.missing)
+            column = [
+                value if math.isfinite(value) else missing
+                for value in column
+            ]
+        return column
+
+    def _render(self, columns: Mapping[str, Sequence],
+                count: int) -> list[str]:
+        """Format count records given as columns of the template fields."""
+        if not self._fields:
+            return [self._format()] * count
+        prepared = {
+            name: self._prepare(name, columns[name])
+            for name in set(self._fields)
+        }
+        return list(starmap(self._format, zip(
+            *[prepared[name] for name in self._fields]
+        )))
+
+    def render(self, info: InfoMessage) -> str:
+        """Return the text of a message."""
+        return self.render_many((info,))[0]
+
+    def render_columns(self, training_types: Iterable[str],
+                       columns: Mapping[str, Sequence[float]]
+                       ) -> list[str]:
+        """
+        Return the texts of results given as columns.
+
+        Arguments:
+        training_types: training type of every result
+        columns: values of the other fields of InfoMessage by name, e.g.
+        the columns of a ResultTable; a BatchResult has no duration, so
+        the duration column of its input has to be added
+        """
+        training_types = list(training_types)
+        return self._render(
+            {**columns, 'training_type': training_types},
+            len(training_types)
+        )
+
+    def render_many(self, messages: Iterable[InfoMessage]) -> list[str]:
+        """Return the texts of a batch of messages."""
+        messages = list(messages)
+        return self._render({
+            name: list(map(attrgetter(name), messages))
+            for name in set(self._fields)
+        }, len(messages))
+
+    def write(self, messages: Iterable[InfoMessage], output: TextIO,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Write the texts of the messages, one per line.
+
+        Returns:
+        number of written messages
+        """
+        count = 0
+        iterator = iter(messages)
+        while chunk := list(islice(iterator, chunk_size)):
+            output.write('\n'.join(self.render_many(chunk)) + '\n')
+            count += len(chunk)
+        return count
+
+
+RENDERERS: dict[str, Renderer] = {}
+
+
+def register_renderer(name: str, renderer: Renderer) -> None:
+    """Register a renderer under a name, e.g. a locale."""
+    RENDERERS[name] = renderer
+
+
+def get_renderer(name: str) -> Renderer:
+    """
+    Return a registered renderer.
+
+    Raises:
+    KeyError: no renderer is registered under the name
+    """
+    try:
+        return RENDERERS[name]
+    except KeyError:
+        raise KeyError(f'Unknown renderer "{name}"') from None
+
+
+ENGLISH_NAMES: dict[str, str] = {
+    'Swimming': 'Swimming',
+    'Running': 'Running',
+    'SportsWalking': 'Sports walking',
+}
+
+ENGLISH: str = (
+    'Training type: {training_type}; '
+    'Duration: {duration:.3f} h; '
+    'Distance: {distance:.3f} %s; '
+    'Avg. speed: {speed:.3f} %s; '
+    'Calories burned: {calories:.3f}.'
+)
+
+register_renderer('ru', Renderer(InfoMessage.MESSAGE))
+register_renderer('en', Renderer(ENGLISH % ('km', 'km/h'),
+                                 names=ENGLISH_NAMES))
+register_renderer('en-imperial', Renderer(
+    ENGLISH % ('mi', 'mph'),
+    scales={'distance': 1 / KM_IN_MILE, 'speed': 1 / KM_IN_MILE},
+    names=ENGLISH_NAMES
+))
+register_renderer('de', Renderer(
+    'Trainingsart: {training_type}; '
+    'Dauer: {duration:.3f} Std.; '
+    'Distanz: {distance:.3f} km; '
+    'Durchschn. Geschwindigkeit: {speed:.3f} km/h; '
+    'Verbrauchte kcal: {calories:.3f}.',
+    names={
+        'Swimming': 'Schwimmen',
+        'Running': 'Laufen',
+        'SportsWalking': 'Sportgehen',
+    }
+))
+register_renderer('json', Renderer(
+    '{{"training_type": {training_type}, "duration": {duration:.3f}, '
+    '"distance": {distance:.3f}, "speed": {speed:.3f}, '
+    '"calories": {calories:.3f}}}',
+    escape=json.dumps, missing='null'
+))
@@ -0,0 +1,196 @@
+"""
+Compact in-memory storage of training results.
+
+A list of ``InfoMessage`` costs a slotted object and four float objects
+per record. ``ResultTable`` keeps a u8 code of the training type, which
+indexes the process-wide TRAINING_TYPES table, and one ``array`` of
+doubles per metric, 33 bytes per record. The name of the training type
+is only resolved when a message is rendered or the records are
+exported.
+
+The codes are process-local: they are assigned in the order the
+training types are first seen, so they differ between processes and
+runs and are unrelated to the workout codes of ``homework`` or to the
+codes of ``store`` and ``sharedmem``. Export or send the names, never
+the codes; a pickled ``ResultTable`` carries the names of its training
+types and gets the codes of the process that loads it.
+"""
+from array import array
+from typing import Any, Iterable, Iterator, TextIO
+
+from homework import InfoMessage, format_messages
+
+METRICS: tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+
+# Names of the training types by code, shared by all tables of the
+# process; the codes are only meaningful within it.
+TRAINING_TYPES: list[str] = []
+_CODES: dict[str, int] = {}
+
+
+def type_code(training_type: str) -> int:
+    """
+    Return the code of a training type, adding it to the table if new.
+
+    The code is only valid in the current process.
+
+    Raises:
+    OverflowError: the table already holds 256 training types
+    """
+    code = _CODES.get(training_type)
+    if code is None:
+        if len(TRAINING_TYPES) > 255:
+            raise OverflowError('No more than 256 training types')
+        code = _CODES[training_type] = len(TRAINING_TYPES)
+        TRAINING_TYPES.append(training_type)
+    return code
+
+
+class ResultTable:
+    """
+    Columnar storage of the results of trainings.
+
+    ...
+
+    Attributes
+    ----------
+    _codes: array
+        index of the training type in TRAINING_TYPES for every row
+    _columns: dict[str, array]
+        values of every metric of InfoMessage
+
+    Methods
+    -------
+    append(info) -> None
+        adds the values of a message to the end of the table
+    append_values(training_type, duration, distance, speed, calories)
+        adds a result given by its values
+    extend(messages) -> None
+        adds several messages to the end of the table
+    column(name) -> memoryview
+        returns a metric column without copying
+    type_codes() -> memoryview
+        returns the process-local training type codes without copying
+    training_type(row) -> str
+        returns the training type of the row
+    get_message(row) -> str
+        returns the message text of the row
+    write(output) -> int
+        writes the message texts of all rows
+    """
+
+    __slots__ = ('_codes', '_columns')
+
+    def __init__(self, messages: Iterable[InfoMessage] = ()) -> None:
+        """
+        Creates an empty table and fills it with the messages.
+
+
+        Parameters
+        ----------
+        messages: Iterable[InfoMessage]
+            results of trainings
+        """
+        self._codes = array('B')
+        self._columns = {name: array('d') for name in METRICS}
+        self.extend(messages)
+
+    def append_values(self, training_type: str, duration: float,
+                      distance: float, speed: float,
+                      calories: float) -> None:
+        """Add a result given by its values."""
+        columns = self._columns
+        self._codes.append(type_code(training_type))
+        columns['duration'].append(duration)
+        columns['distance'].append(distance)
+        columns['speed'].append(speed)
+        columns['calories'].append(calories)
+
+    def append(self, info: InfoMessage) -> None:
+        """Add the values of a message to the end of the table."""
+        self.append_values(info.training_type, info.duration, info.distance,
+                           info.speed, info.calories)
+
+    def extend(self, messages: Iterable[InfoMessage]) -> None:
+        """Add several messages to the end of the table."""
+        codes = self._codes
+        duration, distance, speed, calories = self._columns.values()
+        for info in messages:
+            code = _CODES.get(info.training_type)
+            if code is None:
+                code = type_code(info.training_type)
+            codes.append(code)
+            duration.append(info.duration)
+            distance.append(info.distance)
+            speed.append(info.speed)
+            calories.append(info.calories)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """
+        Replace the process-local codes by indexes of the names in use.
+        """
+        used = sorted(set(self._codes))
+        local = bytearray(256)
+        for index, code in enumerate(used):
+            local[code] = index
+        return {
+            'types': [TRAINING_TYPES[code] for code in used],
+            'codes': self._codes.tobytes().translate(local),
+            'columns': self._columns,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Map the names of the training types to the codes of the process."""
+        codes = bytearray(256)
+        for index, training_type in enumerate(state['types']):
+            codes[index] = type_code(training_type)
+        self._codes = array('B', state['codes'].translate(codes))
+        self._columns = state['columns']
+
+    def column(self, name: str) -> memoryview:
+        """Return a read-only view of a metric column without copying."""
+        return memoryview(self._columns[name]).toreadonly()
+
+    def type_codes(self) -> memoryview:
+        """
+        Return a read-only view of the training type codes of the rows.
+
+        The codes index TRAINING_TYPES and are only valid in the current
+        process.
+        """
+        return memoryview(self._codes).toreadonly()
+
+    def training_type(self, row: int) -> str:
+        """Return the training type of the row."""
+        return TRAINING_TYPES[self._codes[row]]
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, row: int) -> InfoMessage:
+        """Create the InfoMessage of the row."""
+        return InfoMessage(
+            TRAINING_TYPES[self._codes[row]],
+            *(column[row] for column in self._columns.values())
+        )
+
+    def __iter__(self) -> Iterator[InfoMessage]:
+        """Create an InfoMessage for every row, e.g. for an export."""
+        return map(
+            InfoMessage,
+            map(TRAINING_TYPES.__getitem__, self._codes),
+            *self._columns.values()
+        )
+
+    def get_message(self, row: int) -> str:
+        """Return the message text of the row."""
+        return self[row].get_message()
+
+    def write(self, output: TextIO) -> int:
+        """
+        Write the message texts of all rows, one per line.
+
+        Returns:
+        number of written messages
+        """
+        return format_messages(self, output)
@@ -0,0 +1,389 @@
+"""
+Asyncio service receiving packages from sensors.
+
+Every frame is a big-endian u32 length followed by the payload. A
+request carries a package as JSON, ``["SWM", [720, 1, 80, 25, 40]]``;
+a response carries a status byte and either the text of the
+InfoMessage, or in binary mode duration, distance, speed and calories
+as four little-endian doubles, or the text of the error. Packages out
+of the limits of ``validate`` get an error response with the reason.
+
+Usage:
+python -m server [--host HOST] [--port PORT | --unix PATH] [--binary]
+"""
+import argparse
+import asyncio
+import json
+import struct
+from typing import Optional, Sequence
+
+from cache import MessageCache
+from homework import InfoMessage, get_workout, read_package
+from validate import Validator
+
+FRAME = struct.Struct('>I')
+RESULT = struct.Struct('<dddd')
+MAX_FRAME_SIZE: int = 64 * 1024
+
+STATUS_OK: int = 0
+STATUS_ERROR: int = 1
+
+VALIDATOR = Validator()
+
+
+class FrameError(Exception):
+    """The peer sent a frame that cannot be accepted."""
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """
+    Read one frame from the stream.
+
+    Raises:
+    FrameError: the frame is larger than MAX_FRAME_SIZE
+
+    Returns:
+    payload of the frame or None at the end of the stream
+    """
+    try:
+        header = await reader.readexactly(FRAME.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (size,) = FRAME.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise FrameError(f'Frame of {size} bytes is too large')
+    return await reader.readexactly(size)
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Prefix the payload with its length."""
+    return FRAME.pack(len(payload)) + payload
+
+
+def error_payload(reason: str) -> bytes:
+    """Return the payload of an error response."""
+    return bytes((STATUS_ERROR,)) + reason.encode('utf-8')
+
+
+def compute_response(request: bytes,
+                     binary: bool = False,
+                     cache: Optional[MessageCache] = None) -> bytes:
+    """
+    Compute the response payload for the request payload of a package.
+
+    Arguments:
+    request: package encoded as a JSON array
+    binary: return the metrics as doubles instead of the message text
+    cache: cache of the message texts of retransmitted packages
+
+    Returns:
+    status byte followed by the result or the error text
+    """
+    try:
+        workout_type, data = json.loads(request)
+        if not VALIDATOR.is_valid(workout_type, data):
+            return error_payload(
+                VALIDATOR.error(workout_type, data) or 'invalid package'
+            )
+        if cache is not None and not binary:
+            message = cache.get_message(workout_type, data)
+            return bytes((STATUS_OK,)) + message.encode('utf-8')
+        info = read_package(workout_type, data).show_training_info()
+    except Exception as error:
+        return error_payload(str(error))
+    if binary:
+        return bytes((STATUS_OK,)) + RESULT.pack(
+            info.duration, info.distance, info.speed, info.calories
+        )
+    return bytes((STATUS_OK,)) + info.get_message().encode('utf-8')
+
+
+def _compute_group(workout_type: str,
+                   rows: list[tuple[int, list[float]]],
+                   requests: Sequence[bytes],
+                   responses: list[bytes],
+                   binary: bool) -> None:
+    """
+    Compute the responses of the packages of one type together.
+
+    The metrics come from ``batch.compute_batch``. Rows whose metrics
+    are not finite, e.g. with a zero duration, are computed one by one
+    to respond with the same error as the per-object path. Without
+    NumPy, or without a vectorized formula of the type, all rows are.
+    """
+    try:
+        import numpy as np
+
+        from batch import compute_batch
+        fields = get_workout(workout_type).fields
+        durations = [data[fields.index('duration')] for _, data in rows]
+        columns = dict(zip(fields, map(list, zip(*(
+            data for _, data in rows
+        )))))
+        with np.errstate(all='ignore'):
+            result = compute_batch([workout_type] * len(rows), columns)
+    except Exception:
+        for index, _ in rows:
+            responses[index] = compute_response(requests[index], binary)
+        return
+    name = get_workout(workout_type).training.__name__
+    finite = np.isfinite(result.distance) & np.isfinite(result.speed)
+    finite &= np.isfinite(result.calories)
+    for (index, _), duration, distance, speed, calories, ok in zip(
+        rows, durations, result.distance.tolist(), result.speed.tolist(),
+        result.calories.tolist(), finite.tolist()
+    ):
+        if not ok:
+            responses[index] = compute_response(requests[index], binary)
+        elif binary:
+            responses[index] = bytes((STATUS_OK,)) + RESULT.pack(
+                duration, distance, speed, calories
+            )
+        else:
+            responses[index] = bytes((STATUS_OK,)) + InfoMessage(
+                name, duration, distance, speed, calories
+            ).get_message().encode('utf-8')
+
+
+def compute_responses(requests: Sequence[bytes],
+                      binary: bool = False,
+                      cache: Optional[MessageCache] = None) -> list[bytes]:
+    """
+    Compute the response payloads of a micro-batch of requests.
+
+    Packages are checked with the checker of VALIDATOR for their type,
+    valid ones are grouped by training type and every group is computed
+    with the batch engine; invalid packages and, in text mode with a
+    cache, all packages go through compute_response.
+
+    Arguments:
+    requests: packages encoded as JSON arrays
+    binary: return the metrics as doubles instead of the message text
+    cache: cache of the message texts of retransmitted packages
+
+    Returns:
+    response payloads in the order of the requests
+    """
+    responses = [b''] * len(requests)
+    groups: dict[str, list[tuple[int, list[float]]]] = {}
+    for index, request in enumerate(requests):
+        if cache is not None and not binary:
+            responses[index] = compute_response(request, binary, cache)
+            continue
+        try:
+            workout_type, data = json.loads(request)
+            valid = VALIDATOR.checker(workout_type)(data)
+        except Exception:
+            valid = False
+        if not valid:
+            responses[index] = compute_response(request, binary)
+            continue
+        groups.setdefault(workout_type, []).append((index, data))
+    for workout_type, rows in groups.items():
+        _compute_group(workout_type, rows, requests, responses, binary)
+    return responses
+
+
+class PackageServer:
+    """
+    Server accepting framed packages from many device connections.
+
+    Connections put their requests into a bounded queue, so a full queue
+    stops reading from the sockets and pushes back on the devices. A
+    single task takes the requests from the queue in micro-batches of up
+    to batch_size and computes them together with compute_responses in
+    the default executor of the loop, so the loop keeps serving the
+    connections meanwhile.
+
+    ...
+
+    Attributes
+    ----------
+    binary: bool
+        respond with doubles instead of the message text
+    batch_size: int
+        maximum number of packages computed at once
+    cache: Optional[MessageCache]
+        cache of the message texts, used in text mode
+    queue: asyncio.Queue
+        requests waiting for computation with the futures of the responses
+
+    Methods
+    -------
+    start(host, port, path) -> asyncio.AbstractServer
+        starts listening on a TCP port or a Unix socket
+    close() -> None
+        stops the server and the batching task
+    """
+
+    def __init__(self,
+                 binary: bool = False,
+                 batch_size: int = 256,
+                 queue_size: int = 4096,
+                 cache_size: int = 0
+                 ) -> None:
+        """
+        Sets the parameters of the server.
+
+
+        Parameters
+        ----------
+        binary: bool
+            respond with doubles instead of the message text
+        batch_size: int
+            maximum number of packages computed at once
+        queue_size: int
+            maximum number of requests waiting for computation
+        cache_size: int
+            number of cached message texts, 0 disables the cache
+        """
+        self.binary = binary
+        self.batch_size = batch_size
+        self.cache = MessageCache(cache_size) if cache_size else None
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batcher: Optional[asyncio.Task] = None
+
+    async def start(self,
+                    host: Optional[str] = None,
+                    port: int = 0,
+                    path: Optional[str] = None
+                    ) -> asyncio.AbstractServer:
+        """Start listening on a Unix socket if path is given, else TCP."""
+        self._batcher = asyncio.create_task(self._run_batches())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self.handle, path
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self.handle, host, port
+            )
+        return self._server
+
+    async def close(self) -> None:
+        """Stop accepting connections and cancel the batching task."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            await asyncio.gather(self._batcher, return_exceptions=True)
+
+    async def handle(self,
+                     reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of one connection in order."""
+        loop = asyncio.get_running_loop()
+        try:
+            while (request := await read_frame(reader)) is not None:
+                response = loop.create_future()
+                await self.queue.put((request, response))
+                writer.write(encode_frame(await response))
+                await writer.drain()
+        except (FrameError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _run_batches(self) -> None:
+        """Compute the queued requests in micro-batches."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            payloads = await loop.run_in_executor(
+                None, compute_responses, [request for request, _ in batch],
+                self.binary, self.cache
+            )
+            for (_, response), payload in zip(batch, payloads):
+                if not response.done():
+                    response.set_result(payload)
+
+
+class PackageClient:
+    """
+    Client of the server, used by devices and the load generator.
+
+    ...
+
+    Methods
+    -------
+    connect(host, port, path) -> PackageClient
+        opens a connection to the server
+    send(workout_type, data) -> tuple[int, bytes]
+        sends a package and returns the status and result of the response
+    close() -> None
+        closes the connection
+    """
+
+    def __init__(self,
+                 reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls,
+                      host: Optional[str] = None,
+                      port: int = 0,
+                      path: Optional[str] = None) -> 'PackageClient':
+        """Open a connection to a Unix socket if path is given, else TCP."""
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def send(self,
+                   workout_type: str,
+                   data: list[float]) -> tuple[int, bytes]:
+        """Send a package and wait for the response."""
+        self.writer.write(
+            encode_frame(json.dumps([workout_type, data]).encode('utf-8'))
+        )
+        await self.writer.drain()
+        response = await read_frame(self.reader)
+        if not response:
+            raise ConnectionError('Connection closed by the server')
+        return response[0], response[1:]
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Run the server until it is cancelled."""
+    server = PackageServer(args.binary, args.batch_size, args.queue_size,
+                           args.cache_size)
+    listener = await server.start(args.host, args.port, args.unix)
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        prog='python -m server',
+        description='Receive packages from sensors over TCP or Unix sockets.'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', metavar='PATH', help='Unix socket path')
+    parser.add_argument('--binary', action='store_true',
+                        help='respond with doubles instead of text')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--queue-size', type=int, default=4096)
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='cache messages of retransmitted packages')
+    try:
+        asyncio.run(serve(parser.parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Trainings built from streams of per-second sensor samples.
+
+A sample carries its timestamp in seconds and the movements (steps or
+strokes) and pool crossings since the previous sample. The session
+keeps running totals, so adding a sample is O(1), and computes the
+metrics with the formulas of the training class applied to the totals.
+"""
+from collections import deque
+from typing import Optional
+
+from homework import InfoMessage, Training, get_workout
+
+SECONDS_IN_HR: int = 3600
+
+# Constructor parameters accumulated from the samples, the rest are
+# fixed for the session, e.g. weight or pool length.
+SAMPLED: tuple[str, ...] = ('action', 'duration', 'count_pool')
+
+
+class TrainingSession:
+    """
+    Training accumulated from a stream of samples.
+
+    ...
+
+    Attributes
+    ----------
+    workout_type: str
+        training code designation
+    start: Optional[float]
+        timestamp of the start, the first sample if not given
+    last: Optional[float]
+        timestamp of the latest sample
+    action: int
+        total number of movements
+    laps: int
+        total number of pool crossings
+    window: float
+        length of the rolling window in seconds
+
+    Methods
+    -------
+    add(timestamp, count, laps) -> None
+        adds a sample
+    training() -> Training
+        returns the training with the totals of the session
+    rolling_speed() -> float
+        returns the average speed over the rolling window
+    """
+
+    __slots__ = (
+        'workout_type', 'start', 'last', 'action', 'laps', 'window',
+        '_workout', '_params', '_samples', '_window_action', '_window_laps'
+    )
+
+    def __init__(self,
+                 workout_type: str,
+                 start: Optional[float] = None,
+                 window: float = 60.0,
+                 **params: float) -> None:
+        """
+        Creates a session without samples.
+
+
+        Parameters
+        ----------
+        workout_type: str
+            training code designation
+        start: Optional[float]
+            timestamp of the start in seconds
+        window: float
+            length of the rolling window in seconds
+        params: float
+            fixed parameters of the training type, e.g. weight
+        """
+        self._workout = get_workout(workout_type)
+        expected = set(self._workout.fields).difference(SAMPLED)
+        if set(params) != expected:
+            raise TypeError(
+                f'Session "{workout_type}" expects parameters '
+                f'{sorted(expected)}, got {sorted(params)}'
+            )
+        self.workout_type = workout_type
+        self.start = start
+        self.last = start
+        self.action = 0
+        self.laps = 0
+        self.window = window
+        self._params = params
+        self._samples: deque[tuple[float, int, int]] = deque()
+        self._window_action = 0
+        self._window_laps = 0
+
+    def add(self, timestamp: float, count: int, laps: int = 0) -> None:
+        """
+        Add a sample.
+
+        Arguments:
+        timestamp: time of the sample in seconds
+        count: movements since the previous sample
+        laps: pool crossings since the previous sample
+
+        Raises:
+        ValueError: the timestamp is earlier than the previous one
+        """
+        if self.last is not None and timestamp < self.last:
+            raise ValueError(
+                f'Sample at {timestamp} is earlier than {self.last}'
+            )
+        if self.start is None:
+            self.start = timestamp
+        self.last = timestamp
+        self.action += count
+        self.laps += laps
+        self._samples.append((timestamp, count, laps))
+        self._window_action += count
+        self._window_laps += laps
+        self._evict(timestamp - self.window)
+
+    def _evict(self, since: float) -> None:
+        """Drop the samples at or before since from the rolling window."""
+        samples = self._samples
+        while samples and samples[0][0] <= since:
+            _, count, laps = samples.popleft()
+            self._window_action -= count
+            self._window_laps -= laps
+
+    @property
+    def duration(self) -> float:
+        """Time spent training in hours."""
+        if self.start is None or self.last is None:
+            return 0.0
+        return (self.last - self.start) / SECONDS_IN_HR
+
+    def _build(self, action: int, duration: float, laps: int) -> Training:
+        """Create a training of the session type with the given totals."""
+        values = {
+            **self._params,
+            'action': action, 'duration': duration, 'count_pool': laps,
+        }
+        return self._workout.training(
+            *(values[name] for name in self._workout.fields)
+        )
+
+    def training(self) -> Training:
+        """Return the training with the totals of the session."""
+        return self._build(self.action, self.duration, self.laps)
+
+    def get_distance(self) -> float:
+        """Get the distance in kilometers."""
+        return self.training().get_distance()
+
+    def get_mean_speed(self) -> float:
+        """
+        Get the average speed of the whole session.
+
+        Without elapsed time, e.g. after the first sample, the speed is 0.
+        """
+        if not self.duration:
+            return 0.0
+        return self.training().get_mean_speed()
+
+    def get_spent_calories(self) -> float:
+        """
+        Get the number of calories consumed.
+
+        Without elapsed time no calories are spent.
+        """
+        if not self.duration:
+            return 0.0
+        return self.training().get_spent_calories()
+
+    def show_training_info(self) -> InfoMessage:
+        """
+        Return an informational message about the session.
+
+        Without elapsed time the speed and the calories are 0, like in
+        rolling_speed, instead of dividing by the zero duration.
+        """
+        if not self.duration:
+            training = self.training()
+            return InfoMessage(
+                type(training).__name__, 0.0, training.get_distance(),
+                0.0, 0.0
+            )
+        return self.training().show_training_info()
+
+    def rolling_speed(self) -> float:
+        """
+        Get the average speed over the rolling window.
+
+        Early in the session the window is shortened to the time since
+        the start; without elapsed time the speed is 0.
+        """
+        if self.start is None or self.last is None:
+            return 0.0
+        seconds = min(self.window, self.last - self.start)
+        if not seconds:
+            return 0.0
+        return self._build(
+            self._window_action, seconds / SECONDS_IN_HR, self._window_laps
+        ).get_mean_speed()
@@ -0,0 +1,267 @@
+"""
+Shared-memory transport of results from worker processes.
+
+``process_stream_parallel`` pickles the results of every chunk back to
+the parent. Here the parent preallocates one ``SharedMemory`` block
+with a slot of chunk_size rows per chunk in flight; a worker writes
+duration, distance, speed and calories of its chunk straight into the
+double columns of its slot and a code of the training type into a u8
+column, and returns only the number of rows, the names of the codes and
+the rejected lines. The parent formats or aggregates the rows in place.
+
+Block layout, columns of slots * chunk_size rows each:
+
+    duration, distance, speed, calories   float64
+    training type codes                   uint8, indexes into the names
+                                          returned with the chunk
+"""
+from collections import deque
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from homework import InfoMessage
+from pipeline import DEFAULT_CHUNK_SIZE, chunked, stream_messages
+from validate import Rejection
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+VALUES: tuple[str, ...] = ('duration', 'distance', 'speed', 'calories')
+
+ITEMSIZE: int = 8
+
+# Blocks attached by a worker process, by name.
+_attached: dict[str, SharedMemory] = {}
+
+
+def block_size(capacity: int) -> int:
+    """Return the size in bytes of a block for capacity rows."""
+    return capacity * (len(VALUES) * ITEMSIZE + 1)
+
+
+def _views(buffer: memoryview,
+           capacity: int) -> tuple[memoryview, dict[str, memoryview]]:
+    """Return the code column and the double columns of a block."""
+    columns = {}
+    for index, name in enumerate(VALUES):
+        start = index * capacity * ITEMSIZE
+        columns[name] = buffer[start:start + capacity * ITEMSIZE].cast('d')
+    start = len(VALUES) * capacity * ITEMSIZE
+    return buffer[start:start + capacity], columns
+
+
+def fill_slot(name: str, capacity: int, offset: int, lines: list[str],
+              start: int = 0
+              ) -> tuple[int, tuple[str, ...], list[Rejection]]:
+    """
+    Compute a chunk of dump lines in a worker into the rows of a block.
+
+    Arguments:
+    name: name of the shared memory block
+    capacity: number of rows of the block
+    offset: first row of the slot of the chunk
+    lines: dump lines of the chunk
+    start: line number of the first line of the chunk
+
+    Returns:
+    number of written rows, the training types of the codes and the
+    malformed lines and invalid packages of the chunk
+    """
+    block = _attached.get(name)
+    if block is None:
+        block = _attached[name] = SharedMemory(name)
+    codes, columns = _views(block.buf, capacity)
+    names: dict[str, int] = {}
+    duration, distance = columns['duration'], columns['distance']
+    speed, calories = columns['speed'], columns['calories']
+    row = offset
+    rejected: list[Rejection] = []
+    try:
+        for info in stream_messages(lines, rejected, start):
+            code = names.get(info.training_type)
+            if code is None:
+                code = names[info.training_type] = len(names)
+            codes[row] = code
+            duration[row] = info.duration
+            distance[row] = info.distance
+            speed[row] = info.speed
+            calories[row] = info.calories
+            row += 1
+    finally:
+        codes.release()
+        for view in columns.values():
+            view.release()
+    return row - offset, tuple(names), rejected
+
+
+class SharedChunk:
+    """
+    Rows of one chunk read in place from a shared memory block.
+
+    The views stay valid until the generator that yielded the chunk is
+    resumed; copy the values or messages to keep them longer.
+
+    ...
+
+    Attributes
+    ----------
+    names: tuple[str, ...]
+        training types of the codes
+    codes: memoryview
+        training type code of every row
+    columns: dict[str, memoryview]
+        duration, distance, speed and calories of every row
+
+    Methods
+    -------
+    training_types() -> list[str]
+        returns the training type of every row
+    release() -> None
+        releases the views of the block
+    """
+
+    __slots__ = ('names', 'codes', 'columns')
+
+    def __init__(self, names: tuple[str, ...], codes: memoryview,
+                 columns: dict[str, memoryview]) -> None:
+        self.names = names
+        self.codes = codes
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def training_types(self) -> list[str]:
+        """Return the training type of every row."""
+        names = self.names
+        return [names[code] for code in self.codes]
+
+    def __iter__(self) -> Iterator[InfoMessage]:
+        """Create an InfoMessage for every row."""
+        columns = self.columns
+        return map(
+            InfoMessage, self.training_types(), columns['duration'],
+            columns['distance'], columns['speed'], columns['calories']
+        )
+
+    def release(self) -> None:
+        """Release the views, required before the block is closed."""
+        self.codes.release()
+        for view in self.columns.values():
+            view.release()
+
+
+class ResultBlock:
+    """
+    Shared memory block with slots for the results of chunks.
+
+    ...
+
+    Attributes
+    ----------
+    slots: int
+        number of chunks the block holds at once
+    chunk_size: int
+        number of rows of a slot
+    capacity: int
+        number of rows of the block
+
+    Methods
+    -------
+    chunk(slot, count, names) -> SharedChunk
+        returns the rows written into a slot
+    close() -> None
+        releases and removes the block
+    """
+
+    def __init__(self, slots: int, chunk_size: int) -> None:
+        self.slots = slots
+        self.chunk_size = chunk_size
+        self.capacity = slots * chunk_size
+        self.memory = SharedMemory(create=True,
+                                   size=block_size(self.capacity))
+        self._codes, self._columns = _views(self.memory.buf, self.capacity)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def chunk(self, slot: int, count: int,
+              names: tuple[str, ...]) -> SharedChunk:
+        """Return the first count rows of a slot."""
+        start = slot * self.chunk_size
+        return SharedChunk(
+            names,
+            self._codes[start:start + count],
+            {name: view[start:start + count]
+             for name, view in self._columns.items()},
+        )
+
+    def close(self) -> None:
+        """Release the views, close and remove the block."""
+        self._codes.release()
+        for view in self._columns.values():
+            view.release()
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self) -> 'ResultBlock':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def process_stream_shared(stream: Iterable[str],
+                          workers: int,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          rejected: Optional[list[Rejection]] = None
+                          ) -> Iterator[SharedChunk]:
+    """
+    Process a dump of packages on worker processes over shared memory.
+
+    As in ``process_stream_parallel`` two chunks per worker are in
+    flight and chunks are yielded in input order; each yielded chunk is
+    released when the generator is resumed.
+
+    Arguments:
+    stream: lines of a dump, e.g. an open file or sys.stdin
+    workers: number of worker processes
+    chunk_size: number of packages per chunk sent to a worker
+    rejected: list receiving a Rejection for every malformed line and
+    invalid package, in input order as the chunks are yielded
+
+    Returns:
+    iterator over SharedChunk in input order
+    """
+    # Importing the process pool costs more than the serial path needs.
+    from concurrent.futures import ProcessPoolExecutor
+    workers = max(workers, 1)
+    slots = workers * 2
+    with ResultBlock(slots, chunk_size) as block, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        free = deque(range(slots))
+        pending: deque[tuple[int, 'Future']] = deque()
+
+        def collect() -> Iterator[SharedChunk]:
+            slot, future = pending.popleft()
+            count, names, report = future.result()
+            if rejected is not None:
+                rejected.extend(report)
+            chunk = block.chunk(slot, count, names)
+            try:
+                yield chunk
+            finally:
+                chunk.release()
+            free.append(slot)
+
+        for number, lines in enumerate(chunked(stream, chunk_size)):
+            if not free:
+                yield from collect()
+            slot = free.popleft()
+            pending.append((slot, executor.submit(
+                fill_slot, block.name, block.capacity,
+                slot * chunk_size, lines, number * chunk_size
+            )))
+        while pending:
+            yield from collect()
@@ -0,0 +1,291 @@
+"""
+Streaming quantile sketches of training results.
+
+``KLLSketch`` implements the sketch of Karnin, Lang and Liberty: values
+go into a hierarchy of compactors, and a full compactor sorts its items
+and promotes every other one to the next level with double weight. The
+memory stays O(k) regardless of the number of values, sketches of
+different workers merge, and a sketch serializes to bytes.
+
+Error bound: with the default k=200 the normalized rank error of a
+quantile is below 1.65% for 99% of queries, i.e. the value returned
+for q=0.99 has a true rank between 0.9735 and 1.0. The error shrinks
+proportionally to 1/k.
+"""
+import math
+import struct
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from random import Random
+from typing import Iterable, Optional
+
+from homework import InfoMessage
+
+HEADER = struct.Struct('<4sHIdQH')
+MAGIC: bytes = b'KLLS'
+VERSION: int = 1
+
+METRICS: tuple[str, ...] = ('speed', 'calories')
+PERCENTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+
+class KLLSketch:
+    """
+    Mergeable streaming quantile sketch.
+
+    ...
+
+    Attributes
+    ----------
+    k: int
+        capacity of the top compactor, controls the accuracy
+    c: float
+        ratio of the capacities of neighbouring compactors
+    n: int
+        number of values added to the sketch
+
+    Methods
+    -------
+    update(value) -> None
+        adds a value
+    update_many(values) -> None
+        adds several values
+    merge(other) -> None
+        adds the values summarized by another sketch
+    quantile(q) -> float
+        returns an approximate quantile
+    to_bytes() -> bytes
+        serializes the sketch
+    from_bytes(data) -> KLLSketch
+        restores a serialized sketch
+    """
+
+    __slots__ = (
+        'k', 'c', 'n', '_compactors', '_size', '_max_size', '_random',
+        '_sorted'
+    )
+
+    def __init__(self, k: int = 200, c: float = 2 / 3,
+                 seed: Optional[int] = None) -> None:
+        """
+        Creates an empty sketch.
+
+
+        Parameters
+        ----------
+        k: int
+            capacity of the top compactor, at least 8
+        c: float
+            ratio of the capacities of neighbouring compactors
+        seed: Optional[int]
+            seed of the coin flips, for reproducible results
+        """
+        if k < 8:
+            raise ValueError(f'k must be at least 8, got {k}')
+        self.k = k
+        self.c = c
+        self.n = 0
+        self._compactors: list[list[float]] = []
+        self._size = 0
+        self._max_size = 0
+        self._random = Random(seed)
+        self._sorted: Optional[tuple[list[float], list[int]]] = None
+        self._grow()
+
+    def _capacity(self, height: int) -> int:
+        """Return the capacity of the compactor at the height."""
+        depth = len(self._compactors) - height - 1
+        return int(math.ceil(self.c ** depth * self.k)) + 1
+
+    def _grow(self) -> None:
+        """Add a compactor on top of the hierarchy."""
+        self._compactors.append([])
+        self._max_size = sum(
+            self._capacity(height) for height in range(len(self._compactors))
+        )
+
+    def _compress(self) -> None:
+        """Compact the lowest full compactor until the sketch fits."""
+        for height, items in enumerate(self._compactors):
+            if len(items) < self._capacity(height):
+                continue
+            if height + 1 == len(self._compactors):
+                self._grow()
+            items.sort()
+            kept = items[:len(items) % 2]
+            promoted = items[len(kept) + self._random.randrange(2)::2]
+            self._compactors[height] = kept
+            self._compactors[height + 1].extend(promoted)
+            self._size = sum(map(len, self._compactors))
+            if self._size < self._max_size:
+                break
+
+    def update(self, value: float) -> None:
+        """Add a value."""
+        self._compactors[0].append(value)
+        self._size += 1
+        self.n += 1
+        self._sorted = None
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update_many(self, values: Iterable[float]) -> None:
+        """Add several values, e.g. a NumPy array or a list."""
+        if hasattr(values, 'tolist'):
+            values = values.tolist()
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: 'KLLSketch') -> None:
+        """Add the values summarized by another sketch."""
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+        for height, items in enumerate(other._compactors):
+            self._compactors[height].extend(items)
+        self.n += other.n
+        self._size = sum(map(len, self._compactors))
+        self._sorted = None
+        while self._size >= self._max_size:
+            self._compress()
+
+    def _weighted(self) -> tuple[list[float], list[int]]:
+        """Return the sorted items with their cumulative weights."""
+        if self._sorted is None:
+            pairs = sorted(
+                (item, 1 << height)
+                for height, items in enumerate(self._compactors)
+                for item in items
+            )
+            self._sorted = (
+                [item for item, _ in pairs],
+                list(accumulate(weight for _, weight in pairs)),
+            )
+        return self._sorted
+
+    def quantile(self, q: float) -> float:
+        """
+        Return an approximate quantile.
+
+        Arguments:
+        q: fraction between 0 and 1, e.g. 0.99 for the 99th percentile
+
+        Raises:
+        ValueError: the sketch is empty or q is out of range
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f'Quantile must be between 0 and 1, got {q}')
+        if not self.n:
+            raise ValueError('Quantile of an empty sketch')
+        items, cumulative = self._weighted()
+        index = bisect_left(cumulative, q * cumulative[-1])
+        return items[min(index, len(items) - 1)]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the sketch; the state of the coin flips is not kept."""
+        lengths = array('I', map(len, self._compactors))
+        values = array('d', (
+            item for items in self._compactors for item in items
+        ))
+        return (
+            HEADER.pack(MAGIC, VERSION, self.k, self.c, self.n,
+                        len(lengths))
+            + lengths.tobytes() + values.tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes,
+                   seed: Optional[int] = None) -> 'KLLSketch':
+        """
+        Restore a sketch serialized with to_bytes.
+
+        Raises:
+        ValueError: the data is not a serialized sketch
+        """
+        magic, version, k, c, n, levels = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Not a serialized sketch of a known version')
+        lengths = array('I')
+        lengths.frombytes(
+            data[HEADER.size:HEADER.size + levels * lengths.itemsize]
+        )
+        values = array('d')
+        values.frombytes(data[HEADER.size + levels * lengths.itemsize:])
+        if sum(lengths) != len(values):
+            raise ValueError('Serialized sketch is truncated')
+        sketch = cls(k, c, seed)
+        while len(sketch._compactors) < levels:
+            sketch._grow()
+        position = 0
+        for height, length in enumerate(lengths):
+            sketch._compactors[height] = values[
+                position:position + length
+            ].tolist()
+            position += length
+        sketch.n = n
+        sketch._size = len(values)
+        return sketch
+
+
+class Distributions:
+    """
+    Sketches of mean speed and calories per training type.
+
+    ...
+
+    Attributes
+    ----------
+    k: int
+        accuracy parameter of the sketches
+    sketches: dict[tuple[str, str], KLLSketch]
+        sketch by training type and metric
+
+    Methods
+    -------
+    add(info) -> None
+        adds the values of an InfoMessage
+    add_batch(training_type, speeds, calories) -> None
+        adds arrays of values of one training type
+    merge(other) -> None
+        merges the sketches of another instance
+    percentiles(training_type, metric) -> dict[float, float]
+        returns p50, p95 and p99 of a metric
+    """
+
+    __slots__ = ('k', 'sketches')
+
+    def __init__(self, k: int = 200) -> None:
+        self.k = k
+        self.sketches: dict[tuple[str, str], KLLSketch] = {}
+
+    def sketch(self, training_type: str, metric: str) -> KLLSketch:
+        """Return the sketch of a metric, creating it if needed."""
+        if metric not in METRICS:
+            raise ValueError(f'Unknown metric "{metric}"')
+        key = (training_type, metric)
+        if key not in self.sketches:
+            self.sketches[key] = KLLSketch(self.k)
+        return self.sketches[key]
+
+    def add(self, info: InfoMessage) -> None:
+        """Add the mean speed and calories of a training."""
+        self.sketch(info.training_type, 'speed').update(info.speed)
+        self.sketch(info.training_type, 'calories').update(info.calories)
+
+    def add_batch(self, training_type: str, speeds: Iterable[float],
+                  calories: Iterable[float]) -> None:
+        """Add arrays of values of one training type, e.g. from batch."""
+        self.sketch(training_type, 'speed').update_many(speeds)
+        self.sketch(training_type, 'calories').update_many(calories)
+
+    def merge(self, other: 'Distributions') -> None:
+        """Merge the sketches of another instance, e.g. of a worker."""
+        for (training_type, metric), sketch in other.sketches.items():
+            self.sketch(training_type, metric).merge(sketch)
+
+    def percentiles(self, training_type: str, metric: str,
+                    quantiles: Iterable[float] = PERCENTILES
+                    ) -> dict[float, float]:
+        """Return approximate quantiles of a metric of a training type."""
+        sketch = self.sketch(training_type, metric)
+        return {q: sketch.quantile(q) for q in quantiles}
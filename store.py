@@ -0,0 +1,179 @@
+"""
+Columnar in-memory storage of trainings.
+
+A ``WorkoutTable`` keeps one ``array`` of doubles per constructor
+parameter and a column of type codes instead of a ``Training`` instance
+with its own attributes per row. Rows are materialized lazily as
+lightweight views that support the ``Training`` API.
+"""
+from array import array
+from typing import Iterable, Iterator, Union, overload
+
+from homework import Training, check_package, get_workout
+
+# Columns every table starts with; the parameters of training types
+# registered later are added as columns when their first row arrives.
+COLUMNS: tuple[str, ...] = (
+    'action', 'duration', 'weight', 'height', 'length_pool', 'count_pool'
+)
+
+
+def _column_property(name: str) -> property:
+    """Return a property reading ``name`` of the row from the table."""
+    def getter(self: '_RowView') -> float:
+        return self._table._columns[name][self._row]
+    return property(getter, doc=f'Column "{name}" of the row.')
+
+
+class _RowView:
+    """Marker base of the row views created by ``_view_class``."""
+
+    __slots__ = ()
+    _table: 'WorkoutTable'
+    _row: int
+
+
+_VIEWS: dict[type[Training], type[Training]] = {}
+
+
+def _view_class(cls: type[Training]) -> type[Training]:
+    """
+    Return the view class for the rows of a training type.
+
+    The view subclasses the training class, so the formulas and the
+    name reported by ``show_training_info`` are inherited unchanged,
+    while the parameters are read from the table columns. Views are
+    created on first use, so types registered at any time have one.
+    """
+    view = _VIEWS.get(cls)
+    if view is not None:
+        return view
+    namespace = {
+        '__slots__': ('_table', '_row'),
+        '__qualname__': cls.__qualname__,
+        '__module__': cls.__module__,
+    }
+    for name in cls.PARAMETERS:
+        namespace[name] = _column_property(name)
+    view = _VIEWS[cls] = type(cls.__name__, (_RowView, cls), namespace)
+    return view
+
+
+class WorkoutTable:
+    """
+    Columnar storage of trainings.
+
+    ...
+
+    Attributes
+    ----------
+    _codes: array
+        index of the training code in _types for every row
+    _types: list[str]
+        training codes present in the table
+    _columns: dict[str, array]
+        values of every constructor parameter, 0.0 where not applicable
+
+    Methods
+    -------
+    append(workout_type, data) -> None
+        adds a package to the end of the table
+    extend(packages) -> None
+        adds several packages to the end of the table
+    column(name) -> memoryview
+        returns a column without copying
+    workout_type(row) -> str
+        returns the training code of the row
+    """
+
+    __slots__ = ('_codes', '_types', '_columns')
+
+    def __init__(self,
+                 packages: Iterable[tuple[str, list[float]]] = ()
+                 ) -> None:
+        """
+        Creates an empty table and fills it with the packages.
+
+
+        Parameters
+        ----------
+        packages: Iterable[tuple[str, list[float]]]
+            pairs of training code designation and training data
+        """
+        self._codes = array('B')
+        self._types: list[str] = []
+        self._columns = {name: array('d') for name in COLUMNS}
+        self.extend(packages)
+
+    def append(self, workout_type: str, data: list[float]) -> None:
+        """
+        Add a package to the end of the table.
+
+        Raises:
+        UnknownWorkoutTypeError: the code is neither registered
+        nor provided by a plugin
+        PackageSizeError: wrong number of values in data
+        """
+        fields = check_package(workout_type, data).fields
+        # The row is converted before the table changes, so a value
+        # that is not a number leaves the columns aligned.
+        values = {name: float(value) for name, value in zip(fields, data)}
+        row = [values.pop(name, 0.0) for name in self._columns]
+        if workout_type not in self._types and len(self._types) > 255:
+            raise OverflowError('No more than 256 training types')
+        for name in values:
+            self._columns[name] = array('d', bytes(8 * len(self)))
+        row.extend(values.values())
+        for column, value in zip(self._columns.values(), row):
+            column.append(value)
+        if workout_type not in self._types:
+            self._types.append(workout_type)
+        self._codes.append(self._types.index(workout_type))
+
+    def extend(self, packages: Iterable[tuple[str, list[float]]]) -> None:
+        """Add several packages to the end of the table."""
+        for workout_type, data in packages:
+            self.append(workout_type, data)
+
+    def column(self, name: str) -> memoryview:
+        """Return a read-only view of a column without copying."""
+        return memoryview(self._columns[name]).toreadonly()
+
+    def workout_type(self, row: int) -> str:
+        """Return the training code designation of the row."""
+        return self._types[self._codes[row]]
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @overload
+    def __getitem__(self, index: int) -> Training:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'WorkoutTable':
+        ...
+
+    def __getitem__(self,
+                    index: Union[int, slice]
+                    ) -> Union[Training, 'WorkoutTable']:
+        if isinstance(index, slice):
+            table = WorkoutTable()
+            table._codes = self._codes[index]
+            table._types = self._types.copy()
+            table._columns = {
+                name: column[index] for name, column in self._columns.items()
+            }
+            return table
+        row = range(len(self))[index]
+        view_class = _view_class(
+            get_workout(self._types[self._codes[row]]).training
+        )
+        view = view_class.__new__(view_class)
+        view._table = self
+        view._row = row
+        return view
+
+    def __iter__(self) -> Iterator[Training]:
+        for row in range(len(self)):
+            yield self[row]
@@ -0,0 +1,184 @@
+"""
+Bulk CSV and JSONL import of packages and export of results.
+
+Package files have one package per row: CSV with a ``workout_type``
+column followed by the constructor parameters, empty where a training
+type has no such parameter; JSONL with either objects of the same
+columns or ``["SWM", [720, 1, 80, 25, 40]]`` arrays. Readers yield
+batches of packages for ``read_package``; writers emit the fields of
+InfoMessage as typed columns, one large write per chunk.
+"""
+import csv
+import json
+import math
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+from homework import InfoMessage, all_finite, get_workout
+
+Package = tuple[str, list[float]]
+
+RESULT_COLUMNS: tuple[str, ...] = (
+    'training_type', 'duration', 'distance', 'speed', 'calories'
+)
+
+DEFAULT_BATCH_SIZE: int = 8192
+
+
+def _number(text: str) -> float:
+    """Convert a CSV cell of digits to int, any other number to float."""
+    return int(text) if text.isdigit() else float(text)
+
+
+def _json_number(value: float) -> str:
+    """Return a number as JSON, null if it is infinite or NaN."""
+    return repr(value) if math.isfinite(value) else 'null'
+
+
+def _batches(packages: Iterator[Package],
+             batch_size: int) -> Iterator[list[Package]]:
+    """Group packages into lists of at most batch_size."""
+    while batch := list(islice(packages, batch_size)):
+        yield batch
+
+
+def _csv_packages(file: TextIO) -> Iterator[Package]:
+    """Yield the packages of a CSV file with a header row."""
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return
+    index = {name: position for position, name in enumerate(header)}
+    type_column = index['workout_type']
+    layouts: dict[str, list[int]] = {}
+    for row in reader:
+        if not row:
+            continue
+        workout_type = row[type_column]
+        layout = layouts.get(workout_type)
+        if layout is None:
+            layout = layouts[workout_type] = [
+                index[name] for name in get_workout(workout_type).fields
+            ]
+        yield workout_type, [_number(row[position]) for position in layout]
+
+
+def _jsonl_packages(file: TextIO) -> Iterator[Package]:
+    """Yield the packages of a JSONL file with objects or arrays."""
+    fields: dict[str, tuple[str, ...]] = {}
+    for line in file:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if isinstance(record, list):
+            workout_type, data = record
+            yield workout_type, data
+            continue
+        workout_type = record['workout_type']
+        if workout_type not in fields:
+            fields[workout_type] = get_workout(workout_type).fields
+        yield workout_type, [record[name] for name in fields[workout_type]]
+
+
+def read_csv_packages(file: TextIO,
+                      batch_size: int = DEFAULT_BATCH_SIZE
+                      ) -> Iterator[list[Package]]:
+    """
+    Read a CSV package file in batches.
+
+    Raises:
+    UnknownWorkoutTypeError: unknown training code
+    KeyError: a column required by a training type is missing
+
+    Returns:
+    iterator over lists of (workout_type, data) packages
+    """
+    return _batches(_csv_packages(file), batch_size)
+
+
+def read_jsonl_packages(file: TextIO,
+                        batch_size: int = DEFAULT_BATCH_SIZE
+                        ) -> Iterator[list[Package]]:
+    """
+    Read a JSONL package file in batches.
+
+    Raises:
+    UnknownWorkoutTypeError: unknown training code
+    KeyError: a field required by a training type is missing
+
+    Returns:
+    iterator over lists of (workout_type, data) packages
+    """
+    return _batches(_jsonl_packages(file), batch_size)
+
+
+def write_csv(messages: Iterable[InfoMessage], file: TextIO,
+              chunk_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Write the fields of the messages as CSV with a header row.
+
+    Numbers are written with full precision, not rounded as in
+    get_message.
+
+    Returns:
+    number of written messages
+    """
+    file.write(','.join(RESULT_COLUMNS) + '\r\n')
+    count = 0
+    iterator = iter(messages)
+    while chunk := list(islice(iterator, chunk_size)):
+        file.write(''.join([
+            f'{info.training_type},{float(info.duration)!r},'
+            f'{float(info.distance)!r},{float(info.speed)!r},'
+            f'{float(info.calories)!r}\r\n'
+            for info in chunk
+        ]))
+        count += len(chunk)
+    return count
+
+
+def write_jsonl(messages: Iterable[InfoMessage], file: TextIO,
+                chunk_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Write the fields of the messages as JSON objects, one per line.
+
+    Numbers are written with full precision; infinite and NaN values,
+    e.g. of a zero duration or of rows rejected by the validation, are
+    written as null, since JSON has no literal for them.
+
+    Returns:
+    number of written messages
+    """
+    names: dict[str, str] = {}
+    count = 0
+    iterator = iter(messages)
+    while chunk := list(islice(iterator, chunk_size)):
+        lines = []
+        for info in chunk:
+            name = names.get(info.training_type)
+            if name is None:
+                name = names[info.training_type] = json.dumps(
+                    info.training_type
+                )
+            values = (
+                float(info.duration), float(info.distance),
+                float(info.speed), float(info.calories)
+            )
+            duration, distance, speed, calories = values
+            if all_finite(values):
+                lines.append(
+                    f'{{"training_type": {name}, "duration": {duration!r}, '
+                    f'"distance": {distance!r}, "speed": {speed!r}, '
+                    f'"calories": {calories!r}}}\n'
+                )
+                continue
+            lines.append(
+                f'{{"training_type": {name}, '
+                f'"duration": {_json_number(duration)}, '
+                f'"distance": {_json_number(distance)}, '
+                f'"speed": {_json_number(speed)}, '
+                f'"calories": {_json_number(calories)}}}\n'
+            )
+        file.write(''.join(lines))
+        count += len(chunk)
+    return count
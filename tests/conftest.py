@@ -2,6 +2,8 @@ import sys
 from pathlib import Path
 from io import StringIO
 
+import pytest
+
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 sys.path.append(str(BASE_DIR))
 
@@ -27,5 +29,15 @@ class Capturing(list):
         sys.stdout = self._stdout
 
 
+@pytest.fixture
+def messages(request):
+    """Messages of the PACKAGES of the test module."""
+    import homework
+    return [
+        homework.read_package(*package).show_training_info()
+        for package in request.module.PACKAGES
+    ]
+
+
 def pytest_make_parametrize_id(config, val):
     return repr(val)
@@ -0,0 +1,46 @@
+import datetime as dt
+import pickle
+
+import pytest
+
+import aggregate
+import homework
+
+WORKOUTS = [
+    ('anna', dt.date(2024, 3, 4), ('RUN', [15000, 1, 75])),
+    ('anna', dt.date(2024, 3, 6), ('SWM', [720, 1, 80, 25, 40])),
+    ('anna', dt.date(2024, 3, 11), ('RUN', [9000, 1, 75])),
+    ('boris', dt.date(2024, 3, 4), ('WLK', [9000, 1, 75, 180])),
+]
+
+
+def build(workouts):
+    aggregator = aggregate.Aggregator()
+    for user, day, package in workouts:
+        info = homework.read_package(*package).show_training_info()
+        aggregator.add(user, day, info)
+    return aggregator
+
+
+def test_rollups():
+    aggregator = build(WORKOUTS)
+    week = aggregator.rollup('anna', 'week', dt.date(2024, 3, 10))
+    assert week.count == 2
+    assert week.duration == 2
+    month = aggregator.rollup('anna', 'month', dt.date(2024, 3, 31),
+                              'Running')
+    assert month.count == 2
+    assert month.distance == pytest.approx(9.75 + 5.85)
+    assert month.mean_distance == pytest.approx((9.75 + 5.85) / 2)
+    assert aggregator.rollup('boris', 'day', dt.date(2024, 3, 5)).count == 0
+
+
+def test_merge_equals_single_pass():
+    left, right = build(WORKOUTS[:2]), build(WORKOUTS[2:])
+    left.merge(pickle.loads(pickle.dumps(right)))
+    assert dict(left) == dict(build(WORKOUTS))
+
+
+def test_unknown_period():
+    with pytest.raises(ValueError):
+        aggregate.Aggregator().rollup('anna', 'year', dt.date(2024, 1, 1))
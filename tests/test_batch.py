@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+import homework
+
+np = pytest.importorskip('numpy')
+batch = pytest.importorskip('batch')
+
+FIELDS = {
+    'SWM': ('action', 'duration', 'weight', 'length_pool', 'count_pool'),
+    'RUN': ('action', 'duration', 'weight'),
+    'WLK': ('action', 'duration', 'weight', 'height'),
+}
+
+
+def random_packages(size, seed=0):
+    rnd = random.Random(seed)
+    packages = []
+    for _ in range(size):
+        workout_type = rnd.choice(list(FIELDS))
+        data = [
+            rnd.randint(100, 30000),
+            rnd.choice([rnd.randint(1, 5), rnd.uniform(0.1, 5)]),
+            rnd.uniform(40, 120),
+        ]
+        if workout_type == 'WLK':
+            data.append(rnd.uniform(140, 210))
+        elif workout_type == 'SWM':
+            data.extend([rnd.choice([25, 50]), rnd.randint(1, 100)])
+        packages.append((workout_type, data))
+    return packages
+
+
+def to_columns(packages):
+    columns = {name: [0.0] * len(packages) for name in batch.COLUMNS}
+    for row, (workout_type, data) in enumerate(packages):
+        for name, value in zip(FIELDS[workout_type], data):
+            columns[name][row] = value
+    return [workout_type for workout_type, _ in packages], columns
+
+
+def test_compute_batch_bit_identical():
+    packages = random_packages(5000) + [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ]
+    result = batch.compute_batch(*to_columns(packages))
+    for row, package in enumerate(packages):
+        info = homework.read_package(*package).show_training_info()
+        assert result.distance[row] == info.distance
+        assert result.speed[row] == info.speed
+        assert result.calories[row] == info.calories
+
+
+def test_compute_batch_optional_columns():
+    result = batch.compute_batch(
+        ['RUN', 'RUN'],
+        {'action': [15000, 9000], 'duration': [1, 1], 'weight': [75, 75]}
+    )
+    assert result.distance.tolist() == [9.75, 5.85]
+
+
+def test_compute_batch_unknown_code():
+    with pytest.raises(KeyError):
+        batch.compute_batch(
+            ['CYC'], {'action': [1], 'duration': [1], 'weight': [1]}
+        )
+
+
+def test_compute_batch_plugin_formula(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES', {})
+
+    def cycling_formula(cls, col):
+        distance = batch.training_distance(cls, col)
+        return distance, distance / col['duration'], 10 * col['duration']
+
+    @homework.register_workout('CYC', formula=cycling_formula)
+    class Cycling(homework.Training):
+        LEN_STEP = 5.5
+
+    result = batch.compute_batch(
+        ['CYC'], {'action': [1000], 'duration': [2], 'weight': [75]}
+    )
+    assert result.distance.tolist() == [5.5]
+    assert result.calories.tolist() == [20]
+
+
+def test_compute_batch_uses_kernels(monkeypatch):
+    monkeypatch.setattr(homework.Running, 'RATIO_SPEED', 20)
+    result = batch.compute_batch(
+        ['RUN'], {'action': [15000], 'duration': [1], 'weight': [75]}
+    )
+    training = homework.Running(15000, 1, 75)
+    assert result.calories.tolist() == [
+        homework.Running.KERNEL.calories(training, training.get_mean_speed())
+    ]
+    assert result.calories[0] == training.get_spent_calories()
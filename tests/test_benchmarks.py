@@ -0,0 +1,19 @@
+from benchmarks import suite
+
+
+def results(ops_per_sec):
+    return {'results': {'main': {'1000': {'ops_per_sec': ops_per_sec}}}}
+
+
+def test_compare_threshold():
+    assert suite.compare(results(100), results(95), threshold=0.1) == []
+    assert suite.compare(results(100), results(80), threshold=0.1) == [
+        'main at 1000: -20.0% throughput'
+    ]
+    assert suite.compare({'results': {}}, results(1), threshold=0.1) == []
+
+
+def test_run_suite_smoke():
+    report = suite.run_suite([10], repeat=1, names=list(suite.CASES))
+    assert set(report['results']) == set(suite.CASES)
+    assert report['results']['main']['10']['ops_per_sec'] > 0
@@ -0,0 +1,40 @@
+import pytest
+
+import cache
+import homework
+
+
+def message(workout_type, data):
+    return homework.read_package(workout_type, data).show_training_info(
+    ).get_message()
+
+
+def test_hits_misses_and_eviction():
+    messages = cache.MessageCache(maxsize=2)
+    assert messages.get_message('RUN', [15000, 1, 75]) == message(
+        'RUN', [15000, 1, 75]
+    )
+    messages.get_message('RUN', [15000, 1, 75])
+    messages.get_message('SWM', [720, 1, 80, 25, 40])
+    messages.get_message('WLK', [9000, 1, 75, 180])
+    messages.get_message('RUN', [15000, 1, 75])
+    info = messages.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 4, 2)
+
+
+def test_invalidate_on_constant_change(monkeypatch):
+    messages = cache.MessageCache()
+    before = messages.get_message('RUN', [15000, 1, 75])
+    assert not messages.check_constants()
+    monkeypatch.setattr(homework.Running, 'RATIO_SPEED', 20)
+    assert messages.get_message('RUN', [15000, 1, 75]) == before
+    assert messages.check_constants()
+    assert messages.info().currsize == 0
+    assert messages.get_message('RUN', [15000, 1, 75]) == message(
+        'RUN', [15000, 1, 75]
+    ) != before
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        cache.MessageCache(maxsize=0)
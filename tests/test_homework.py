@@ -1,8 +1,11 @@
+import io
+import math
+import random
 import re
 import pytest
 import types
 import inspect
-from collections import namedtuple
+from collections import Counter, namedtuple
 from conftest import Capturing
 
 try:
@@ -451,3 +454,294 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+@pytest.mark.parametrize('input_data', [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+])
+def test_slots(input_data):
+    training = homework.read_package(*input_data)
+    assert vars(training) == {}, (
+        'Атрибуты тренировки должны храниться в `__slots__`.'
+    )
+    info = training.show_training_info()
+    assert not hasattr(info, '__dict__'), (
+        '`InfoMessage` должен использовать `__slots__`.'
+    )
+
+
+@pytest.mark.parametrize('input_data', [
+    ['Swimming', 1, 75, 1, 80],
+    ['Running', 0.0005, 2.0005, 1e-9, 123456789.0125],
+    ['SportsWalking', 2.512, 1.9502145, 0.776359, 408.42891],
+])
+def test_InfoMessage_precompiled_format(input_data):
+    info_message = homework.InfoMessage(*input_data)
+    expected = homework.InfoMessage.MESSAGE.format(
+        **dict(zip(homework.InfoMessage.__match_args__, input_data))
+    )
+    assert info_message.get_message() == expected
+    output = io.StringIO()
+    assert homework.format_messages([info_message] * 2, output) == 2
+    assert output.getvalue() == f'{expected}\n{expected}\n'
+
+
+@pytest.mark.parametrize('template, expected', [
+    ('Only {training_type}', 'Only Running'),
+    ('{calories:.1f} kcal', '797.8 kcal'),
+    ('No fields {{}}', 'No fields {}'),
+])
+def test_compile_template_field_count(template, expected):
+    info = homework.InfoMessage('Running', 1, 9.75, 9.75, 797.805)
+    compiled, fields = homework.compile_template(template)
+    assert isinstance(fields(info), tuple)
+    assert compiled.format(*fields(info)) == expected
+
+
+def test_read_package_unknown_code():
+    with pytest.raises(homework.UnknownWorkoutTypeError) as error:
+        homework.read_package('CYC', [15000, 1, 75])
+    assert error.value.workout_type == 'CYC'
+    assert isinstance(error.value, KeyError)
+
+
+@pytest.mark.parametrize('input_data, expected', [
+    (('SWM', [720, 1, 80, 25]), 5),
+    (('RUN', [15000, 1, 75, 180]), 3),
+    (('WLK', []), 4),
+])
+def test_read_package_size(input_data, expected):
+    with pytest.raises(homework.PackageSizeError) as error:
+        homework.read_package(*input_data)
+    assert error.value.workout_type == input_data[0]
+    assert error.value.expected == expected
+    assert error.value.received == len(input_data[1])
+
+
+def test_check_package():
+    workout = homework.check_package('WLK', [9000, 1, 75, 180])
+    assert workout.training is homework.SportsWalking
+    assert workout.fields == ('action', 'duration', 'weight', 'height')
+    with pytest.raises(homework.PackageSizeError):
+        homework.check_package('WLK', [9000, 1, 75])
+    with pytest.raises(homework.UnknownWorkoutTypeError):
+        homework.check_package('CYC', [15000, 1, 75])
+
+
+def test_register_workout(monkeypatch):
+    monkeypatch.setitem(homework.WORKOUT_TYPES, 'CYC', None)
+    homework.register_workout('CYC', homework.Running)
+    assert homework.WORKOUT_TYPES['CYC'].fields == (
+        'action', 'duration', 'weight'
+    )
+    assert isinstance(
+        homework.read_package('CYC', [15000, 1, 75]), homework.Running
+    )
+
+
+def test_register_workout_decorator(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES', {})
+
+    @homework.register_workout('CYC')
+    class Cycling(homework.Training):
+        LEN_STEP = 5.5
+
+        def get_spent_calories(self):
+            return 10 * self.duration
+
+    assert homework.WORKOUT_TYPES['CYC'].training is Cycling
+    info = homework.read_package('CYC', [1000, 2, 75]).show_training_info()
+    assert (info.training_type, info.distance, info.calories) == (
+        'Cycling', 5.5, 20
+    )
+
+
+def test_plugin_discovery(monkeypatch):
+    from importlib import metadata
+
+    requested = []
+
+    def entry_points(group, name):
+        requested.append((group, name))
+        return [metadata.EntryPoint(
+            name=name, value='homework:Running', group=group
+        )]
+
+    monkeypatch.setattr(metadata, 'entry_points', entry_points)
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES', {})
+    monkeypatch.setattr(homework, '_searched_plugins', set())
+    training = homework.read_package('RUN', [15000, 1, 75])
+    assert isinstance(training, homework.Running)
+    homework.read_package('RUN', [15000, 1, 75])
+    assert requested == [(homework.PLUGIN_GROUP, 'RUN')]
+
+
+@pytest.mark.parametrize('input_data', [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+])
+def test_metrics_computed_once(monkeypatch, input_data):
+    calls = Counter()
+    training = homework.read_package(*input_data)
+    cls = type(training)
+    kernel = cls.KERNEL
+    for name in kernel._fields:
+        formula = getattr(kernel, name)
+
+        def counted_formula(*args, formula=formula, name=name):
+            calls[name] += 1
+            return formula(*args)
+        monkeypatch.setattr(
+            cls, 'KERNEL', cls.KERNEL._replace(**{name: counted_formula})
+        )
+
+    info = training.show_training_info()
+    assert calls == {'distance': 1, 'speed': 1, 'calories': 1}
+    assert info == type(info)(cls.__name__, training.duration, *(
+        getattr(kernel, name)(training, *args)
+        for name, args in (('distance', ()),
+                           ('speed', (training.get_distance(),)),
+                           ('calories', (training.get_mean_speed(),)))
+    ))
+
+    calls.clear()
+    training.weight *= 2
+    assert training.show_training_info().calories != info.calories
+    assert calls == {'distance': 1, 'speed': 1, 'calories': 1}
+
+
+def test_overridden_metric_method_is_shown(monkeypatch):
+    training = homework.Running(15000, 1, 75)
+    monkeypatch.setattr(homework.Training, 'get_mean_speed',
+                        lambda self: 42.0)
+    assert homework.Running._overrides_metrics
+    info = training.show_training_info()
+    assert info.speed == 42.0
+    assert info.calories == training.get_spent_calories()
+    monkeypatch.undo()
+    assert not homework.Running._overrides_metrics
+    assert training.show_training_info().speed == 9.75
+
+
+def test_metrics_follow_constants(monkeypatch):
+    training = homework.Running(15000, 1, 75)
+    assert training.get_spent_calories() == pytest.approx(797.805)
+    monkeypatch.setattr(homework.Running, 'RATIO_SPEED', 20)
+    assert training.show_training_info().calories == (
+        homework.Running(15000, 1, 75).get_spent_calories()
+    )
+    assert training.get_spent_calories() == pytest.approx(885.555)
+
+
+def reference_metrics(cls, data):
+    """Textbook formulas reading the constants through the class."""
+    if cls is homework.Swimming:
+        action, duration, weight, length_pool, count_pool = data
+        speed = length_pool * count_pool / cls.M_IN_KM / duration
+        calories = (
+            (speed + cls.SHIFT_MEAN_SPEED) * cls.FACTOR * weight * duration
+        )
+    else:
+        action, duration, weight = data[:3]
+        speed = action * cls.LEN_STEP / cls.M_IN_KM / duration
+        if cls is homework.Running:
+            calories = (
+                (cls.RATIO_SPEED * speed + cls.RATIO_SPEED_SHIFT) * weight
+                / cls.M_IN_KM * (duration * cls.MIN_IN_HR)
+            )
+        else:
+            calories = (
+                (cls.RATIO_WEIGHT_USER * weight
+                 + ((speed * cls.KMH_IN_MSEC) ** 2
+                    / (data[3] / cls.CM_IN_M))
+                 * cls.RATIO_WEIGHT_SPEED_USER * weight)
+                * (duration * cls.MIN_IN_HR)
+            )
+    return action * cls.LEN_STEP / cls.M_IN_KM, speed, calories
+
+
+def test_kernels_agree_within_one_ulp():
+    rnd = random.Random(7)
+    for _ in range(3000):
+        code = rnd.choice(['SWM', 'RUN', 'WLK'])
+        data = [rnd.randint(100, 30000), rnd.uniform(0.2, 3),
+                rnd.uniform(40, 120)]
+        if code == 'WLK':
+            data.append(rnd.uniform(140, 210))
+        elif code == 'SWM':
+            data.extend([rnd.choice([25, 50]), rnd.randint(1, 100)])
+        training = homework.read_package(code, data)
+        kernel = type(training).KERNEL
+        distance = kernel.distance(training)
+        speed = kernel.speed(training, distance)
+        computed = (distance, speed, kernel.calories(training, speed))
+        methods = (
+            training.get_distance(), training.get_mean_speed(),
+            training.get_spent_calories()
+        )
+        assert computed == methods
+        for value, expected in zip(
+            computed, reference_metrics(type(training), data)
+        ):
+            assert abs(value - expected) <= math.ulp(expected)
+
+
+def test_kernel_follows_constants(monkeypatch):
+    training = homework.Running(15000, 1, 75)
+    before = training.get_spent_calories()
+    kernel = homework.Running.KERNEL
+    monkeypatch.setattr(homework.Training, 'M_IN_KM', 2000)
+    assert homework.Running.KERNEL is not kernel
+    assert homework.Running(15000, 1, 75).get_distance() == 4.875
+    monkeypatch.undo()
+    assert homework.Running(15000, 1, 75).get_spent_calories() == before
+
+
+def test_kernel_of_subclass():
+    class Trail(homework.Running):
+        LEN_STEP = 0.5
+
+    assert Trail.PARAMETERS == ('action', 'duration', 'weight')
+    assert Trail(1000, 1, 75).get_distance() == 0.5
+    assert homework.Running(1000, 1, 75).get_distance() == 0.65
+    with pytest.raises(NotImplementedError):
+        homework.Training(1000, 1, 75).get_spent_calories()
+
+
+def test_subclass_with_own_constructor(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES', {})
+
+    @homework.register_workout('TRD')
+    class Treadmill(homework.Running):
+        PARAMETERS = ('action',)
+
+        def __init__(self, action):
+            super().__init__(action, 1, 75)
+
+    class Rest(homework.Training):
+        PARAMETERS = ()
+
+        def __init__(self):
+            super().__init__(0, 1, 75)
+
+    info = homework.read_package('TRD', [15000]).show_training_info()
+    expected = homework.Running(15000, 1, 75).show_training_info()
+    assert info.training_type == 'Treadmill'
+    assert (info.distance, info.speed, info.calories) == (
+        expected.distance, expected.speed, expected.calories
+    )
+    with pytest.raises(homework.PackageSizeError):
+        homework.read_package('TRD', [15000, 1, 75])
+    assert Rest().get_distance() == 0
+    assert Rest().get_mean_speed() == 0
+
+
+def test_constructor_without_parameters():
+    with pytest.raises(TypeError, match='PARAMETERS'):
+        class Cycling(homework.Training):
+            def __init__(self, action, duration, weight, power):
+                super().__init__(action, duration, weight)
+                self.power = power
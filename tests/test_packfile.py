@@ -0,0 +1,65 @@
+import pytest
+
+import homework
+import packfile
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1.5, 75, 180]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / 'packages.wkpk')
+    assert packfile.write_packages(path, PACKAGES) == len(PACKAGES)
+    return path
+
+
+def test_round_trip(path):
+    with packfile.PackageFile(path) as packages:
+        assert len(packages) == len(PACKAGES)
+        assert list(packages) == PACKAGES
+        assert packages.columns['count_pool'].format == 'q'
+        assert packages.columns['action'].format == 'd'
+        messages = [
+            homework.read_package(*package).show_training_info()
+            for package in packages
+        ]
+    assert messages == [
+        homework.read_package(*package).show_training_info()
+        for package in PACKAGES
+    ]
+
+
+def test_compute_batch(path):
+    pytest.importorskip('numpy')
+    with packfile.PackageFile(path) as packages:
+        result = packages.compute_batch()
+        calories = result.calories.tolist()
+    assert calories == [
+        homework.read_package(*package).get_spent_calories()
+        for package in PACKAGES
+    ]
+
+
+@pytest.mark.parametrize('size', [-8, -3, -1, 20, 11, 3, 0])
+def test_corrupted_file(path, size):
+    with open(path, 'r+b') as file:
+        length = len(file.read())
+        file.truncate(size if size >= 0 else length + size)
+    with pytest.raises(ValueError):
+        packfile.PackageFile(path)
+
+
+def test_corrupted_typecode(path):
+    with open(path, 'r+b') as file:
+        content = bytearray(file.read())
+        content[content.index(b'action') + len('action')] = ord('x')
+        file.seek(0)
+        file.write(content)
+    with pytest.raises(ValueError):
+        packfile.PackageFile(path)
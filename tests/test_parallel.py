@@ -0,0 +1,79 @@
+import asyncio
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+np = pytest.importorskip('numpy')
+batch = pytest.importorskip('batch')
+parallel = pytest.importorskip('parallel')
+
+COLUMNS = {
+    'SWM': {
+        'action': [720, 1000, 2000], 'duration': [1, 1.5, 0.5],
+        'weight': [80, 70, 60], 'length_pool': [25, 50, 25],
+        'count_pool': [40, 10, 30],
+    },
+    'RUN': {
+        'action': [15000, 9000, 12000], 'duration': [1, 0.8, 1.2],
+        'weight': [75, 80, 65],
+    },
+    'WLK': {
+        'action': [9000, 3000.33, 6000], 'duration': [1, 2.512, 1.1],
+        'weight': [75, 75.8, 90], 'height': [180, 180.1, 170],
+    },
+}
+
+
+def expected(workout_type):
+    columns = COLUMNS[workout_type]
+    return batch.compute_batch([workout_type] * 3, columns)
+
+
+@pytest.mark.parametrize('workout_type', list(COLUMNS))
+def test_matches_compute_batch(workout_type):
+    with ThreadPoolExecutor(2) as executor:
+        result = parallel.compute_buffers(
+            workout_type, COLUMNS[workout_type], executor, block_size=2
+        )
+    for name, values in expected(workout_type)._asdict().items():
+        assert getattr(result, name).tolist() == values.tolist()
+
+
+def test_buffers_are_not_copied():
+    action = array('d', [15000, 9000])
+    assert np.shares_memory(parallel.as_column(action), np.asarray(action))
+    result = parallel.compute_buffers('RUN', {
+        'action': action,
+        'duration': memoryview(array('d', [1, 1])),
+        'weight': np.array([75, 75]),
+    })
+    assert result.distance.tolist() == [9.75, 5.85]
+
+
+def test_async_wrapper():
+    async def compute():
+        with ThreadPoolExecutor(2) as executor:
+            return await parallel.compute_buffers_async(
+                'WLK', COLUMNS['WLK'], executor, block_size=1
+            )
+
+    result = asyncio.run(compute())
+    assert result.calories.tolist() == expected('WLK').calories.tolist()
+
+
+def test_invalid_columns():
+    with pytest.raises(ValueError):
+        parallel.compute_buffers(
+            'RUN', {'action': [1, 2], 'duration': [1], 'weight': [1]}
+        )
+    with pytest.raises(KeyError):
+        parallel.compute_buffers('RUN', {'action': [1], 'duration': [1]})
+    with pytest.raises(ValueError):
+        parallel.compute_buffers('RUN', COLUMNS['RUN'], block_size=0)
+
+
+def test_rows_out_of_limits():
+    columns = {**COLUMNS['RUN'], 'action': [15000, -9000, 12000]}
+    with pytest.raises(ValueError, match='Row 1 of "RUN".*"action"'):
+        parallel.compute_buffers('RUN', columns)
@@ -0,0 +1,139 @@
+import io
+import json
+from itertools import islice
+
+import pytest
+
+import homework
+import pipeline
+
+DUMP = (
+    '["SWM", [720, 1, 80, 25, 40]]\n'
+    '\n'
+    '["RUN", [15000, 1, 75]]\n'
+    '["WLK", [9000, 1, 75, 180]]\n'
+)
+
+# Lines rejected by the validation, after a zero duration on line 0 and
+# a blank line 1, and their (index, workout_type) in the report.
+BAD_LINES = [
+    'SWM 720 1 80 25 40',
+    '["CYC", [1, 2, 3]]',
+    '["WLK", [9000, 1, 75]]',
+    '["RUN", ["fast", 1, 75]]',
+    '["RUN", 5]',
+    '["RUN", null]',
+    '[["RUN"], [1, 1, 75]]',
+]
+BAD_REPORT = [
+    (0, 'RUN'), (2, ''), (3, 'CYC'), (4, 'WLK'), (5, 'RUN'), (6, 'RUN'),
+    (7, 'RUN'), (8, ''),
+]
+
+
+def expected_lines():
+    return [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in [
+            ('SWM', [720, 1, 80, 25, 40]),
+            ('RUN', [15000, 1, 75]),
+            ('WLK', [9000, 1, 75, 180]),
+        ]
+    ]
+
+
+def test_process_stream_chunks():
+    chunks = list(pipeline.process_stream(io.StringIO(DUMP), chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert [
+        info.get_message() for chunk in chunks for info in chunk
+    ] == expected_lines()
+
+
+def test_process_stream_is_lazy():
+    def endless():
+        while True:
+            yield '["RUN", [15000, 1, 75]]\n'
+
+    chunks = pipeline.process_stream(endless(), chunk_size=10)
+    assert [len(chunk) for chunk in islice(chunks, 3)] == [10, 10, 10]
+
+
+def test_parse_package_malformed():
+    with pytest.raises(ValueError):
+        pipeline.parse_package('SWM 720 1 80 25 40')
+
+
+def test_run(tmp_path):
+    source = tmp_path / 'dump.ndjson'
+    target = tmp_path / 'out.txt'
+    source.write_text(DUMP, encoding='utf-8')
+    assert pipeline.run([str(source), '-o', str(target)]) == 0
+    assert target.read_text(encoding='utf-8').splitlines() == (
+        expected_lines()
+    )
+
+
+def test_process_stream_parallel_keeps_order():
+    lines = DUMP.splitlines() * 5
+    chunks = pipeline.process_stream_parallel(lines, workers=2, chunk_size=2)
+    assert [
+        info.get_message() for chunk in chunks for info in chunk
+    ] == expected_lines() * 5
+
+
+def test_compute_chunk_round_trip():
+    messages = [
+        info for chunk in pipeline.process_stream(io.StringIO(DUMP))
+        for info in chunk
+    ]
+    types, values, rejected = pipeline.compute_chunk(DUMP.splitlines())
+    assert pipeline.decode_chunk(types, values) == messages
+    assert rejected == []
+
+
+def test_process_stream_rejects_invalid_lines():
+    rejected = []
+    chunks = pipeline.process_stream(
+        ['["RUN",[1,0,75]]', ''] + BAD_LINES + DUMP.splitlines(),
+        rejected=rejected
+    )
+    assert [
+        info.get_message() for chunk in chunks for info in chunk
+    ] == expected_lines()
+    assert [(item.index, item.workout_type) for item in rejected] == (
+        BAD_REPORT
+    )
+    assert '"duration"' in rejected[0].reason
+    assert list(pipeline.process_stream(['["RUN",[1,0,75]]'])) == []
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 8])
+def test_parallel_rejections_keep_line_numbers(chunk_size):
+    rejected = []
+    lines = ['["RUN",[1,0,75]]', ''] + BAD_LINES + DUMP.splitlines()
+    chunks = pipeline.process_stream_parallel(
+        lines, workers=2, chunk_size=chunk_size, rejected=rejected
+    )
+    assert [
+        info.get_message() for chunk in chunks for info in chunk
+    ] == expected_lines()
+    assert [(item.index, item.workout_type) for item in rejected] == (
+        BAD_REPORT
+    )
+
+
+def test_run_writes_rejections(tmp_path):
+    source = tmp_path / 'dump.ndjson'
+    target = tmp_path / 'out.txt'
+    report = tmp_path / 'rejected.jsonl'
+    source.write_text(DUMP + '\n'.join(BAD_LINES) + '\n', encoding='utf-8')
+    assert pipeline.run([str(source), '-o', str(target),
+                         '--rejected', str(report)]) == 0
+    assert target.read_text(encoding='utf-8').splitlines() == (
+        expected_lines()
+    )
+    assert [
+        (item['index'], item['workout_type'])
+        for item in map(json.loads, report.read_text('utf-8').splitlines())
+    ] == [(index + 2, workout_type) for index, workout_type in BAD_REPORT[1:]]
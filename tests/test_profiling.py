@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import homework
+import pipeline
+import profiling
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    profiling.reset()
+    yield
+    profiling.disable()
+    profiling.reset()
+
+
+def test_disabled_by_default():
+    original = homework.read_package
+    profiling.enable()
+    assert profiling.is_enabled()
+    assert homework.read_package is not original
+    assert pipeline.read_package is homework.read_package
+    profiling.disable()
+    assert homework.read_package is original
+    assert pipeline.read_package is original
+    assert homework.read_package('RUN', [15000, 1, 75])
+    assert profiling.stats() == {}
+
+
+def test_stats_per_training_type():
+    with profiling.instrumented():
+        for package in [('RUN', [15000, 1, 75]), ('RUN', [9000, 1, 75]),
+                        ('SWM', [720, 1, 80, 25, 40])]:
+            homework.main(homework.read_package(*package))
+    stats = profiling.stats()
+    assert stats[('read_package', 'Running')].calls == 2
+    assert stats[('show_training_info', 'Running')].calls == 2
+    assert stats[('get_message', 'Swimming')].calls == 1
+    assert all(value.seconds > 0 for value in stats.values())
+    records = json.loads(profiling.snapshot_json())
+    assert len(records) == 6
+    assert 'show_training_info' in profiling.snapshot_text()
+
+
+def test_keyword_and_failed_calls():
+    with profiling.instrumented():
+        training = homework.read_package(
+            workout_type='RUN', data=[15000, 1, 75]
+        )
+        with pytest.raises(homework.UnknownWorkoutTypeError):
+            homework.read_package('CYC', [15000, 1, 75])
+        with pytest.raises(homework.PackageSizeError):
+            homework.read_package(workout_type='RUN', data=[15000])
+        with pytest.raises(TypeError):
+            homework.read_package()
+    assert isinstance(training, homework.Running)
+    stats = profiling.stats()
+    assert stats[('read_package', 'Running')].calls == 1
+    assert stats[('read_package', 'CYC')].calls == 1
+    assert stats[('read_package', 'RUN')].calls == 1
+    assert stats[('read_package', '')].calls == 1
@@ -0,0 +1,118 @@
+import io
+import json
+import math
+import sys
+
+import pytest
+
+import homework
+import render
+import results
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+
+def test_ru_matches_get_message(messages):
+    renderer = render.get_renderer('ru')
+    expected = [info.get_message() for info in messages]
+    assert renderer.render_many(messages) == expected
+    assert renderer.render(messages[1]) == expected[1]
+
+
+def test_localized_names(messages):
+    info = messages[2]
+    assert render.get_renderer('en').render(info).startswith(
+        'Training type: Sports walking; Duration: 1.000 h; '
+        'Distance: 5.850 km;'
+    )
+    assert render.get_renderer('de').render(info).startswith(
+        'Trainingsart: Sportgehen;'
+    )
+
+
+def test_imperial_units(messages):
+    info = messages[1]
+    text = render.get_renderer('en-imperial').render(info)
+    assert f'Distance: {info.distance / render.KM_IN_MILE:.3f} mi;' in text
+    assert f'Avg. speed: {info.speed / render.KM_IN_MILE:.3f} mph;' in text
+
+
+def test_json(messages):
+    for info, text in zip(
+        messages, render.get_renderer('json').render_many(messages)
+    ):
+        record = json.loads(text)
+        assert record['training_type'] == info.training_type
+        assert record['calories'] == round(info.calories, 3)
+
+
+@pytest.mark.parametrize('name', list(render.RENDERERS))
+def test_bulk_matches_single(name, messages):
+    renderer = render.get_renderer(name)
+    assert renderer.render_many(messages) == [
+        renderer.render(info) for info in messages
+    ]
+    table = results.ResultTable(messages)
+    assert renderer.render_columns(
+        [table.training_type(row) for row in range(len(table))],
+        {name: table.column(name) for name in results.METRICS}
+    ) == renderer.render_many(messages)
+    output = io.StringIO()
+    assert renderer.write(messages, output, chunk_size=2) == 3
+    assert output.getvalue().splitlines() == renderer.render_many(messages)
+
+
+def test_registry(monkeypatch, messages):
+    monkeypatch.setattr(render, 'RENDERERS', {})
+    render.register_renderer(
+        'short', render.Renderer('{training_type}: {calories:.0f} kcal')
+    )
+    assert render.get_renderer('short').render(messages[0]) == (
+        'Swimming: 336 kcal'
+    )
+    with pytest.raises(KeyError):
+        render.get_renderer('ru')
+    with pytest.raises(ValueError):
+        render.Renderer('{training_type} {pace}')
+    assert render.Renderer('{calories:.1f}').render_many(messages[:1]) == [
+        '336.0'
+    ]
+
+
+def test_templates_with_few_fields(messages):
+    assert render.Renderer('Type: {training_type}').render_many(
+        messages
+    ) == ['Type: Swimming', 'Type: Running', 'Type: SportsWalking']
+    assert render.Renderer('{training_type!r:>12}').render(
+        messages[1]
+    ) == '   \'Running\''
+    assert render.Renderer('No fields {{}}').render_many(messages) == [
+        'No fields {}'
+    ] * 3
+
+
+def test_json_non_finite():
+    info = homework.InfoMessage('Running', 0.0, 1.5, math.inf, math.nan)
+    record = json.loads(render.get_renderer('json').render(info))
+    assert record == {
+        'training_type': 'Running', 'duration': 0.0, 'distance': 1.5,
+        'speed': None, 'calories': None,
+    }
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_scale_column(monkeypatch, numpy, messages):
+    if numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setitem(sys.modules, 'numpy', None)
+    table = results.ResultTable(messages)
+    scale = 1 / render.KM_IN_MILE
+    assert render.scale_column(table.column('speed'), scale) == [
+        info.speed * scale for info in messages
+    ]
@@ -0,0 +1,76 @@
+import io
+import pickle
+
+import pytest
+
+import homework
+import results
+import tabular
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+
+def test_rows_match_messages(messages):
+    table = results.ResultTable(messages)
+    assert len(table) == len(PACKAGES)
+    assert list(table) == messages
+    assert table[2] == messages[2]
+    assert table.training_type(3) == 'Running'
+    assert table.get_message(0) == messages[0].get_message()
+    assert table.column('calories').tolist() == [
+        info.calories for info in messages
+    ]
+
+
+def test_codes_are_shared(messages):
+    first = results.ResultTable(messages)
+    second = results.ResultTable()
+    second.append_values('Running', 1.0, 9.75, 9.75, 797.805)
+    code = second.type_codes()[0]
+    assert code == first.type_codes()[1]
+    assert results.TRAINING_TYPES[code] == second.training_type(0)
+    assert results.type_code('Running') == code
+    assert [
+        results.TRAINING_TYPES[code] for code in first.type_codes()
+    ] == [info.training_type for info in messages]
+
+
+def test_write_and_export(messages):
+    table = results.ResultTable(messages)
+    output = io.StringIO()
+    assert table.write(output) == len(PACKAGES)
+    expected = io.StringIO()
+    homework.format_messages(messages, expected)
+    assert output.getvalue() == expected.getvalue()
+
+    exported = io.StringIO()
+    assert tabular.write_csv(table, exported) == len(PACKAGES)
+    plain = io.StringIO()
+    tabular.write_csv(messages, plain)
+    assert exported.getvalue() == plain.getvalue()
+
+
+def test_column_is_read_only(messages):
+    table = results.ResultTable(messages)
+    with pytest.raises(TypeError):
+        table.column('speed')[0] = 0.0
+
+
+def test_pickle_maps_codes_by_name(monkeypatch, messages):
+    table = results.ResultTable(messages)
+    dumped = pickle.dumps(table)
+    # Another process sees the training types in another order.
+    monkeypatch.setattr(results, 'TRAINING_TYPES', [])
+    monkeypatch.setattr(results, '_CODES', {})
+    for training_type in ('Walking', 'SportsWalking', 'Running'):
+        results.type_code(training_type)
+    loaded = pickle.loads(dumped)
+    assert list(loaded) == messages
+    assert list(loaded.type_codes()) == [3, 2, 1, 2]
+    assert results.TRAINING_TYPES[3] == 'Swimming'
@@ -0,0 +1,116 @@
+import asyncio
+import struct
+
+import pytest
+
+import homework
+import server
+
+PACKAGE = ('RUN', [15000, 1, 75])
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def exchange(packages, binary=False, path=None, connections=3,
+                   cache_size=0):
+    package_server = server.PackageServer(
+        binary=binary, batch_size=4, cache_size=cache_size
+    )
+    listener = await package_server.start('127.0.0.1', 0, path)
+    port = None if path else listener.sockets[0].getsockname()[1]
+    try:
+        clients = [
+            await server.PackageClient.connect('127.0.0.1', port, path)
+            for _ in range(connections)
+        ]
+
+        async def send_all(client):
+            return [await client.send(*package) for package in packages]
+
+        responses = await asyncio.gather(*map(send_all, clients))
+        for client in clients:
+            await client.close()
+    finally:
+        await package_server.close()
+    return responses
+
+
+@pytest.mark.parametrize('cache_size', [0, 16])
+def test_text_responses(cache_size):
+    packages = [PACKAGE, ('SWM', [720, 1, 80, 25, 40])]
+    for responses in run(exchange(packages, cache_size=cache_size)):
+        assert responses == [
+            (server.STATUS_OK, homework.read_package(*package)
+             .show_training_info().get_message().encode('utf-8'))
+            for package in packages
+        ]
+
+
+def test_binary_response_over_unix_socket(tmp_path):
+    [[(status, payload)]] = run(exchange(
+        [PACKAGE], binary=True, path=str(tmp_path / 'tracker.sock'),
+        connections=1
+    ))
+    info = homework.read_package(*PACKAGE).show_training_info()
+    assert status == server.STATUS_OK
+    assert struct.unpack('<dddd', payload) == (
+        info.duration, info.distance, info.speed, info.calories
+    )
+
+
+def test_error_response():
+    [[(status, payload)]] = run(exchange(
+        [('CYC', [1, 2, 3])], connections=1
+    ))
+    assert status == server.STATUS_ERROR
+    assert b'CYC' in payload
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_compute_responses_match_single(binary):
+    requests = [
+        b'["RUN", [15000, 1, 75]]',
+        b'["SWM", [720, 1, 80, 25, 40]]',
+        b'["RUN", [1206, 12, 6]]',
+        b'["RUN", [15000, 0, 75]]',
+        b'["WLK", [9000, 1, 75]]',
+        b'["CYC", [1, 2, 3]]',
+        b'not json',
+        b'["WLK", [9000, 1, 75, 180]]',
+    ]
+    assert server.compute_responses(requests, binary) == [
+        server.compute_response(request, binary) for request in requests
+    ]
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_invalid_packages_are_rejected(binary):
+    requests = [b'["RUN", [-15000, 1, 75]]', b'["RUN", [15000, 0, 75]]',
+                b'["RUN", 5]']
+    responses = server.compute_responses(requests, binary)
+    assert [response[0] for response in responses] == [
+        server.STATUS_ERROR
+    ] * 3
+    assert b'"action" is -15000' in responses[0]
+    assert b'"duration" is 0' in responses[1]
+    assert server.compute_response(requests[0], binary) == responses[0]
+
+
+def test_disconnect_mid_frame():
+    class Writer:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    async def disconnect():
+        reader = asyncio.StreamReader()
+        reader.feed_data(struct.pack('>I', 100) + b'["RUN"')
+        reader.feed_eof()
+        writer = Writer()
+        await server.PackageServer().handle(reader, writer)
+        return writer.closed
+
+    assert run(disconnect())
@@ -0,0 +1,60 @@
+import pytest
+
+import homework
+import session
+
+
+def test_running_matches_totals():
+    running = session.TrainingSession('RUN', start=0, weight=75)
+    for second in range(1, 3601):
+        running.add(second, 4 + second % 3)
+    action = sum(4 + second % 3 for second in range(1, 3601))
+    expected = homework.Running(action, 1.0, 75).show_training_info()
+    assert running.show_training_info() == expected
+    assert running.get_spent_calories() == expected.calories
+
+
+def test_swimming_counts_laps():
+    swimming = session.TrainingSession(
+        'SWM', start=0, weight=80, length_pool=25
+    )
+    for second in range(1, 1801):
+        swimming.add(second, 1, laps=1 if second % 45 == 0 else 0)
+    expected = homework.Swimming(1800, 0.5, 80, 25, 40)
+    assert swimming.get_mean_speed() == expected.get_mean_speed()
+    assert swimming.get_spent_calories() == expected.get_spent_calories()
+
+
+def test_rolling_speed():
+    walking = session.TrainingSession('WLK', window=60, weight=75, height=180)
+    walking.add(0, 0)
+    assert walking.rolling_speed() == 0
+    for second in range(1, 121):
+        walking.add(second, 2 if second <= 60 else 1)
+    assert walking.rolling_speed() == pytest.approx(
+        60 * homework.SportsWalking.LEN_STEP / 1000 * 60
+    )
+    assert walking.duration == pytest.approx(120 / 3600)
+
+
+def test_invalid_samples_and_params():
+    running = session.TrainingSession('RUN', weight=75)
+    running.add(10, 5)
+    with pytest.raises(ValueError):
+        running.add(9, 5)
+    with pytest.raises(TypeError):
+        session.TrainingSession('WLK', weight=75)
+
+
+@pytest.mark.parametrize('workout_type, params', [
+    ('RUN', {'weight': 75}),
+    ('WLK', {'weight': 75, 'height': 180}),
+    ('SWM', {'weight': 80, 'length_pool': 25}),
+])
+def test_no_elapsed_time(workout_type, params):
+    training = session.TrainingSession(workout_type, **params)
+    training.add(10, 1000)
+    info = training.show_training_info()
+    assert (info.duration, info.speed, info.calories) == (0, 0, 0)
+    assert info.distance == training.get_distance()
+    assert training.get_mean_speed() == training.get_spent_calories() == 0
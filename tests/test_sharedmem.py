@@ -0,0 +1,83 @@
+import io
+import json
+
+import pytest
+
+import homework
+import pipeline
+import sharedmem
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+] * 7
+
+
+def dump():
+    return [json.dumps(package) + '\n' for package in PACKAGES]
+
+
+def test_chunks_match_serial_path():
+    chunks = sharedmem.process_stream_shared(dump(), workers=2, chunk_size=4)
+    sizes = []
+    messages = []
+    for chunk in chunks:
+        sizes.append(len(chunk))
+        messages.extend(chunk)
+    assert sizes == [4, 4, 4, 4, 4, 1]
+    assert messages == [
+        homework.read_package(*package).show_training_info()
+        for package in PACKAGES
+    ]
+
+
+def test_columns_are_read_in_place():
+    expected = [
+        homework.read_package(*package).show_training_info()
+        for package in PACKAGES
+    ]
+    calories = []
+    types = []
+    for chunk in sharedmem.process_stream_shared(dump(), 2, chunk_size=5):
+        calories.extend(chunk.columns['calories'])
+        types.extend(chunk.training_types())
+    assert calories == [info.calories for info in expected]
+    assert types == [info.training_type for info in expected]
+
+
+def test_chunk_is_released_on_resume():
+    chunks = sharedmem.process_stream_shared(dump(), 2, chunk_size=4)
+    first = next(chunks)
+    next(chunks)
+    with pytest.raises(ValueError):
+        first.columns['speed'][0]
+    chunks.close()
+
+
+def test_rejections_reach_the_parent():
+    lines = dump() + ['["XYZ", [1, 2]]\n', '["RUN", [1, 0, 75]]\n']
+    rejected = []
+    messages = [
+        info for chunk in sharedmem.process_stream_shared(
+            lines, 2, chunk_size=4, rejected=rejected
+        )
+        for info in chunk
+    ]
+    assert len(messages) == len(PACKAGES)
+    assert [(item.index, item.workout_type) for item in rejected] == [
+        (len(PACKAGES), 'XYZ'), (len(PACKAGES) + 1, 'RUN')
+    ]
+
+
+def test_run_with_shared_memory(tmp_path):
+    source = tmp_path / 'dump.ndjson'
+    target = tmp_path / 'out.txt'
+    source.write_text(''.join(dump()), encoding='utf-8')
+    assert pipeline.run([str(source), '-o', str(target), '--workers', '2',
+                         '--chunk-size', '3', '--shared-memory']) == 0
+    output = io.StringIO()
+    homework.format_messages(
+        pipeline.iter_messages(PACKAGES), output
+    )
+    assert target.read_text(encoding='utf-8') == output.getvalue()
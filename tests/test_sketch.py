@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+import homework
+import sketch
+
+QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+# Documented bound of 1.65% for k=200 with some slack for the seeds.
+RANK_ERROR = 0.02
+
+
+def rank(values, value):
+    """Return the normalized rank of the value in the sorted values."""
+    return sum(item <= value for item in values) / len(values)
+
+
+def fill(values, seed=0, k=200):
+    result = sketch.KLLSketch(k, seed=seed)
+    result.update_many(values)
+    return result
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_quantiles_within_error_bound(seed):
+    generator = random.Random(seed)
+    values = [generator.lognormvariate(6, 0.5) for _ in range(50_000)]
+    estimated = fill(values, seed)
+    assert estimated.n == len(values)
+    assert len(estimated.to_bytes()) < 16 * 1024
+    ordered = sorted(values)
+    for q in QUANTILES:
+        assert abs(rank(ordered, estimated.quantile(q)) - q) <= RANK_ERROR
+
+
+def test_small_input_is_exact():
+    values = [5.0, 1.0, 3.0, 2.0, 4.0]
+    estimated = fill(values)
+    assert estimated.quantile(0) == 1.0
+    assert estimated.quantile(0.5) == 3.0
+    assert estimated.quantile(1) == 5.0
+
+
+def test_merge_matches_single_stream():
+    generator = random.Random(1)
+    values = [generator.gauss(10, 2) for _ in range(40_000)]
+    merged = fill(values[:10_000], seed=1)
+    for start in range(10_000, 40_000, 10_000):
+        merged.merge(fill(values[start:start + 10_000], seed=start))
+    assert merged.n == len(values)
+    ordered = sorted(values)
+    for q in QUANTILES:
+        assert abs(rank(ordered, merged.quantile(q)) - q) <= RANK_ERROR
+
+
+def test_bytes_round_trip():
+    original = fill([float(value) for value in range(10_000)], seed=2)
+    restored = sketch.KLLSketch.from_bytes(original.to_bytes())
+    assert restored.n == original.n
+    assert restored.k == original.k
+    for q in QUANTILES:
+        assert restored.quantile(q) == original.quantile(q)
+    restored.update(1.0)
+    assert restored.n == original.n + 1
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        sketch.KLLSketch().quantile(0.5)
+    with pytest.raises(ValueError):
+        fill([1.0]).quantile(1.5)
+    with pytest.raises(ValueError):
+        sketch.KLLSketch.from_bytes(b'\0' * sketch.HEADER.size)
+
+
+def test_distributions_from_messages_and_batches():
+    distributions = sketch.Distributions()
+    speeds = []
+    for action in range(1000, 11000, 10):
+        info = homework.Running(action, 1, 75).show_training_info()
+        distributions.add(info)
+        speeds.append(info.speed)
+    distributions.add_batch('Running', speeds, [1.0] * len(speeds))
+    percentiles = distributions.percentiles('Running', 'speed')
+    assert set(percentiles) == set(sketch.PERCENTILES)
+    ordered = sorted(speeds * 2)
+    for q, value in percentiles.items():
+        assert abs(rank(ordered, value) - q) <= RANK_ERROR
+    assert distributions.sketch('Running', 'calories').n == 2 * len(speeds)
+
+    worker = sketch.Distributions()
+    worker.add(homework.Swimming(720, 1, 80, 25, 40).show_training_info())
+    distributions.merge(worker)
+    assert distributions.sketch('Swimming', 'speed').n == 1
+    with pytest.raises(ValueError):
+        distributions.sketch('Running', 'distance')
+
+
+def test_batch_arrays():
+    np = pytest.importorskip('numpy')
+    values = np.random.default_rng(3).exponential(5, 20_000)
+    estimated = fill(values)
+    ordered = np.sort(values)
+    for q in QUANTILES:
+        position = np.searchsorted(ordered, estimated.quantile(q), 'right')
+        assert abs(position / len(values) - q) <= RANK_ERROR
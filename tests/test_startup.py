@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+import pytest
+
+from conftest import BASE_DIR
+
+HEAVY = ('numpy', 'asyncio', 'concurrent.futures', 'importlib.metadata')
+
+
+def run_python(*args, stdin=''):
+    return subprocess.run(
+        [sys.executable, *args], input=stdin, capture_output=True,
+        text=True, cwd=BASE_DIR, check=True
+    ).stdout
+
+
+@pytest.mark.parametrize('module', ['homework', 'pipeline', 'store'])
+def test_minimal_path_skips_heavy_modules(module):
+    loaded = run_python('-c', (
+        f'import sys, {module}; '
+        f'print(*[name for name in {HEAVY!r} if name in sys.modules])'
+    ))
+    assert loaded.split() == []
+
+
+def test_run_command():
+    output = run_python(
+        '-m', 'homework', 'process', stdin='["RUN", [15000, 1, 75]]\n'
+    )
+    assert output.startswith('Тип тренировки: Running;')
+    assert len(run_python('-m', 'homework').splitlines()) == 3
@@ -0,0 +1,84 @@
+import pytest
+
+import homework
+import store
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+]
+
+
+def test_rows_match_training():
+    table = store.WorkoutTable(PACKAGES)
+    assert len(table) == len(PACKAGES)
+    for view, package in zip(table, PACKAGES):
+        training = homework.read_package(*package)
+        assert isinstance(view, type(training))
+        assert view.get_distance() == training.get_distance()
+        assert view.get_mean_speed() == training.get_mean_speed()
+        assert view.get_spent_calories() == training.get_spent_calories()
+        assert view.show_training_info() == training.show_training_info()
+
+
+def test_slicing_and_columns():
+    table = store.WorkoutTable(PACKAGES)
+    tail = table[1:3]
+    assert isinstance(tail, store.WorkoutTable)
+    assert [tail.workout_type(row) for row in range(len(tail))] == [
+        'RUN', 'WLK'
+    ]
+    assert tail.column('action').tolist() == [15000, 9000]
+    assert table[-1].height == 180.1
+    with pytest.raises(IndexError):
+        table[len(PACKAGES)]
+
+
+def test_append_validates_package():
+    table = store.WorkoutTable()
+    with pytest.raises(TypeError):
+        table.append('RUN', [15000, 1])
+    with pytest.raises(KeyError):
+        table.append('CYC', [15000, 1, 75])
+    assert len(table) == 0
+
+
+def test_failed_append_leaves_table_aligned():
+    table = store.WorkoutTable()
+    with pytest.raises(ValueError):
+        table.append('RUN', [1, 'x', 3])
+    with pytest.raises(ValueError):
+        table.append('SWM', [720, 1, 80, 25, 'x'])
+    assert len(table) == 0
+    table.append('RUN', [15000, 1, 75])
+    assert table[0].get_spent_calories() == pytest.approx(797.805)
+    assert table.workout_type(0) == 'RUN'
+    assert table._types == ['RUN']
+    assert {len(table.column(name)) for name in store.COLUMNS} == {1}
+
+
+def test_type_registered_later(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES', dict(
+        homework.WORKOUT_TYPES
+    ))
+
+    @homework.register_workout('HIK')
+    class Hiking(homework.Running):
+        PARAMETERS = ('action', 'duration', 'weight', 'incline')
+
+        def __init__(self, action, duration, weight, incline):
+            super().__init__(action, duration, weight)
+            self.incline = incline
+
+    table = store.WorkoutTable(PACKAGES)
+    table.append('HIK', [15000, 1, 75, 0.1])
+    view = table[-1]
+    assert isinstance(view, Hiking)
+    assert table.workout_type(len(table) - 1) == 'HIK'
+    assert view.incline == 0.1
+    assert table.column('incline').tolist() == [0.0] * len(PACKAGES) + [0.1]
+    assert view.show_training_info() == homework.read_package(
+        'HIK', [15000, 1, 75, 0.1]
+    ).show_training_info()
@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+
+import pytest
+
+import homework
+import tabular
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+]
+
+CSV = (
+    'workout_type,action,duration,weight,height,length_pool,count_pool\n'
+    'SWM,720,1,80,,25,40\n'
+    'RUN,15000,1,75,,,\n'
+    'WLK,3000.33,2.512,75.8,180.1,,\n'
+)
+
+JSONL = (
+    '{"workout_type": "SWM", "action": 720, "duration": 1, "weight": 80,'
+    ' "length_pool": 25, "count_pool": 40}\n'
+    '["RUN", [15000, 1, 75]]\n'
+    '\n'
+    '{"workout_type": "WLK", "action": 3000.33, "duration": 2.512,'
+    ' "weight": 75.8, "height": 180.1}\n'
+)
+
+
+
+@pytest.mark.parametrize('reader, text', [
+    (tabular.read_csv_packages, CSV),
+    (tabular.read_jsonl_packages, JSONL),
+])
+def test_read_packages(reader, text):
+    batches = list(reader(io.StringIO(text), batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [package for batch in batches for package in batch] == PACKAGES
+
+
+def test_write_csv(messages):
+    output = io.StringIO()
+    assert tabular.write_csv(messages, output, chunk_size=2) == 3
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert [
+        homework.InfoMessage(
+            row['training_type'],
+            *(float(row[name]) for name in tabular.RESULT_COLUMNS[1:])
+        )
+        for row in rows
+    ] == messages
+
+
+def test_write_jsonl(messages):
+    output = io.StringIO()
+    assert tabular.write_jsonl(messages, output) == 3
+    assert [
+        homework.InfoMessage(**json.loads(line))
+        for line in output.getvalue().splitlines()
+    ] == messages
+
+
+def test_write_jsonl_non_finite(messages):
+    info = homework.InfoMessage(
+        'Running', 0, 9.75, float('inf'), float('nan')
+    )
+    output = io.StringIO()
+    assert tabular.write_jsonl([info] + messages, output) == 4
+    lines = output.getvalue().splitlines()
+    assert json.loads(lines[0]) == {
+        'training_type': 'Running', 'duration': 0.0, 'distance': 9.75,
+        'speed': None, 'calories': None,
+    }
+    assert [
+        homework.InfoMessage(**json.loads(line)) for line in lines[1:]
+    ] == messages
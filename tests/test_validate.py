@@ -0,0 +1,118 @@
+import math
+
+import pytest
+
+import homework
+import validate
+
+VALID = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+INVALID = [
+    (('RUN', [15000, 0, 75]), '"duration" is 0'),
+    (('WLK', [9000, 1, 75, 0]), '"height" is 0'),
+    (('RUN', [-5, 1, 75]), '"action" is -5'),
+    (('SWM', [720, 1, 80, 25, math.nan]), '"count_pool" is nan'),
+    (('SWM', [720, 1, 'heavy', 25, 40]), 'expected a number'),
+    (('RUN', [15000, 1]), 'expects 3 values, got 2'),
+    (('XYZ', [1, 2, 3]), 'Unknown training code "XYZ"'),
+    (('RUN', 5), 'Training data is 5, expected a list'),
+    (('RUN', None), 'Training data is None, expected a list'),
+]
+
+
+def test_split_packages():
+    packages = VALID + [package for package, _ in INVALID] + VALID
+    valid, rejected = validate.split_packages(packages)
+    assert valid == VALID + VALID
+    assert [rejection.index for rejection in rejected] == list(
+        range(len(VALID), len(VALID) + len(INVALID))
+    )
+    for rejection, (package, reason) in zip(rejected, INVALID):
+        assert rejection.workout_type == package[0]
+        assert reason in rejection.reason
+    for workout_type, data in valid:
+        homework.read_package(workout_type, data).show_training_info()
+
+
+def test_is_valid_matches_error():
+    validator = validate.Validator()
+    for workout_type, data in VALID:
+        assert validator.is_valid(workout_type, data)
+        assert validator.error(workout_type, data) is None
+    for (workout_type, data), _ in INVALID:
+        assert not validator.is_valid(workout_type, data)
+        assert validator.error(workout_type, data)
+
+
+def test_malformed_training_code():
+    rejected = []
+    assert list(validate.filter_packages(
+        [(['RUN'], [1, 1, 75]), (None, [1, 1, 75])] + VALID, rejected
+    )) == VALID
+    assert [(item.index, item.workout_type) for item in rejected] == [
+        (0, ''), (1, '')
+    ]
+    assert 'expected a string' in rejected[0].reason
+
+
+def test_rejections_discarded_without_list():
+    packages = [package for package, _ in INVALID] + VALID
+    assert list(validate.filter_packages(packages)) == VALID
+
+
+def test_custom_limits():
+    validator = validate.Validator(
+        {**validate.LIMITS, 'weight': validate.Bounds(50, 100)}
+    )
+    assert not validator.is_valid('RUN', [15000, 1, 120])
+    assert validate.Validator().is_valid('RUN', [15000, 1, 120])
+
+
+def test_filter_packages_is_lazy():
+    rejected = []
+    packages = validate.filter_packages(
+        iter([('RUN', [1, 0, 75])] + VALID), rejected
+    )
+    assert next(packages) == VALID[0]
+    assert len(rejected) == 1
+
+
+def test_compute_valid_batch():
+    np = pytest.importorskip('numpy')
+    batch = pytest.importorskip('batch')
+    packages = VALID + [package for package, _ in INVALID[:4]]
+    columns = {name: [np.nan] * len(packages) for name in batch.COLUMNS}
+    for row, (workout_type, data) in enumerate(packages):
+        for name, value in zip(
+            homework.get_workout(workout_type).fields, data
+        ):
+            columns[name][row] = value
+    types = [workout_type for workout_type, _ in packages] + ['XYZ']
+    for values in columns.values():
+        values.append(1.0)
+
+    computed = batch.compute_valid_batch(types, columns)
+    assert computed.valid.tolist() == [True] * 3 + [False] * 5
+    assert [rejection.index for rejection in computed.rejected] == list(
+        range(3, 8)
+    )
+    assert '"height" is 0.0' in computed.rejected[1].reason
+    assert 'XYZ' in computed.rejected[-1].reason
+    for row, package in enumerate(VALID):
+        info = homework.read_package(*package).show_training_info()
+        assert computed.result.calories[row] == info.calories
+    assert np.isnan(computed.result.speed[3:]).all()
+
+
+def test_compute_valid_batch_missing_column():
+    pytest.importorskip('numpy')
+    batch = pytest.importorskip('batch')
+    computed = batch.compute_valid_batch(
+        ['WLK'], {'action': [9000], 'duration': [1], 'weight': [75]}
+    )
+    assert not computed.valid.any()
+    assert 'height' in computed.rejected[0].reason
@@ -0,0 +1,257 @@
+"""
+Validation of packages before they reach the formulas.
+
+A zero duration or height makes the formulas divide by zero, and
+negative or absurd sensor values produce meaningless results. The
+checks here split the input into valid packages and a report of the
+rejected ones with the reason, so one bad package does not stop a
+whole run. ``batch.compute_valid_batch`` applies the same limits to
+column arrays.
+"""
+import math
+from typing import (Callable, Iterable, Iterator, Mapping, NamedTuple,
+                    Optional, Sequence)
+
+from homework import (PackageError, UnknownWorkoutTypeError,
+                      check_package, get_workout)
+
+Package = tuple[str, list[float]]
+
+
+class Bounds(NamedTuple):
+    """Inclusive range of valid values of a parameter."""
+
+    low: float
+    high: float
+
+
+# Limits by constructor parameter; parameters of plugin types without
+# limits only have to be finite numbers.
+LIMITS: dict[str, Bounds] = {
+    'action': Bounds(0, 1_000_000),
+    'duration': Bounds(1 / 3600, 48),
+    'weight': Bounds(20, 400),
+    'height': Bounds(50, 300),
+    'length_pool': Bounds(10, 100),
+    'count_pool': Bounds(0, 10_000),
+}
+
+ANY_NUMBER = Bounds(-math.inf, math.inf)
+
+
+class Rejection(NamedTuple):
+    """
+    Package rejected by the validation.
+
+    ...
+
+    Attributes
+    ----------
+    index: int
+        position of the package in the input
+    workout_type: str
+        training code designation from the package
+    reason: str
+        why the package was rejected
+    """
+
+    index: int
+    workout_type: str
+    reason: str
+
+
+def shape_reason(workout_type: object, data: object) -> Optional[str]:
+    """
+    Describe a package that is not a training code and a list of values.
+
+    Returns:
+    reason of the rejection or None for a well-formed package
+    """
+    if not isinstance(workout_type, str):
+        return f'Training code is {workout_type!r}, expected a string'
+    if not isinstance(data, (list, tuple)):
+        return f'Training data is {data!r}, expected a list'
+    return None
+
+
+def range_reason(name: str, value: object, bounds: Bounds) -> str:
+    """Describe a value of a parameter outside of its bounds."""
+    return (
+        f'"{name}" is {value!r}, expected from {bounds.low:g} '
+        f'to {bounds.high:g}'
+    )
+
+
+class Validator:
+    """
+    Checks packages against the limits of their parameters.
+
+    The bounds of every training type are looked up once, so a valid
+    package costs a few comparisons; the reason is only worked out for
+    rejected packages.
+
+    ...
+
+    Attributes
+    ----------
+    limits: dict[str, Bounds]
+        bounds of the values by parameter name
+
+    Methods
+    -------
+    checker(workout_type) -> Callable
+        returns the check of a training type
+    is_valid(workout_type, data) -> bool
+        checks the arity and the ranges of a package
+    error(workout_type, data) -> Optional[str]
+        returns the reason of the rejection of a package
+    """
+
+    __slots__ = ('limits', '_checks')
+
+    def __init__(self, limits: Mapping[str, Bounds] = LIMITS) -> None:
+        self.limits = dict(limits)
+        self._checks: dict[str, Callable[[Sequence[float]], bool]] = {}
+
+    def bounds(self, name: str) -> Bounds:
+        """Return the bounds of a parameter."""
+        return self.limits.get(name, ANY_NUMBER)
+
+    def checker(self, workout_type: str
+                ) -> Callable[[Sequence[float]], bool]:
+        """
+        Return the check of the data of a training type.
+
+        The bounds are looked up once per training type, so a check only
+        compares the values with a tuple of (index, low, high).
+
+        Raises:
+        UnknownWorkoutTypeError: the code is not registered
+        """
+        check = self._checks.get(workout_type)
+        if check is not None:
+            return check
+        fields = get_workout(workout_type).fields
+        size = len(fields)
+        limits = tuple(
+            (index, *self.bounds(name)) for index, name in enumerate(fields)
+        )
+
+        def check(data: Sequence[float]) -> bool:
+            try:
+                if len(data) != size:
+                    return False
+                for index, low, high in limits:
+                    if not low <= data[index] <= high:
+                        return False
+            except (TypeError, LookupError):
+                return False
+            return True
+
+        self._checks[workout_type] = check
+        return check
+
+    def is_valid(self, workout_type: str, data: Sequence[float]) -> bool:
+        """Check the arity and the ranges of a package."""
+        if not isinstance(workout_type, str):
+            return False
+        try:
+            return self.checker(workout_type)(data)
+        except UnknownWorkoutTypeError:
+            return False
+
+    def error(self, workout_type: str,
+              data: Sequence[float]) -> Optional[str]:
+        """
+        Check a package and explain why it is invalid.
+
+        Returns:
+        reason of the rejection or None for a valid package
+        """
+        reason = shape_reason(workout_type, data)
+        if reason is not None:
+            return reason
+        try:
+            fields = check_package(workout_type, data).fields
+        except PackageError as error:
+            return str(error)
+        for name, value in zip(fields, data):
+            bounds = self.bounds(name)
+            try:
+                if bounds.low <= value <= bounds.high:
+                    continue
+            except TypeError:
+                return f'"{name}" is {value!r}, expected a number'
+            return range_reason(name, value, bounds)
+        return None
+
+
+def filter_numbered_packages(packages: Iterable[tuple[int, Package]],
+                             rejected: Optional[list[Rejection]] = None,
+                             validator: Optional[Validator] = None
+                             ) -> Iterator[Package]:
+    """
+    Yield the valid packages and report the others under their numbers.
+
+    Arguments:
+    packages: pairs of a number, e.g. the line of a dump, and a
+    (workout_type, data) package
+    rejected: list receiving a Rejection for every invalid package,
+    the rejections are discarded if None
+    validator: limits to check against, LIMITS by default
+    """
+    validator = validator or Validator()
+    checks: dict[str, Callable[[Sequence[float]], bool]] = {}
+    for index, package in packages:
+        workout_type, data = package
+        try:
+            check = checks.get(workout_type)
+        except TypeError:
+            # An unhashable training code, e.g. a list, is rejected below.
+            check = None
+        if check is None:
+            check = _reject_all
+            if isinstance(workout_type, str):
+                try:
+                    check = checks[workout_type] = validator.checker(
+                        workout_type
+                    )
+                except UnknownWorkoutTypeError:
+                    pass
+        if check(data):
+            yield package
+        elif rejected is not None:
+            rejected.append(Rejection(
+                index, workout_type if isinstance(workout_type, str) else '',
+                validator.error(workout_type, data) or 'invalid package'
+            ))
+
+
+def _reject_all(data: object) -> bool:
+    """Check of the packages of an unknown training code."""
+    return False
+
+
+def filter_packages(packages: Iterable[Package],
+                    rejected: Optional[list[Rejection]] = None,
+                    validator: Optional[Validator] = None
+                    ) -> Iterator[Package]:
+    """
+    Yield the valid packages and report the others.
+
+    Arguments:
+    packages: (workout_type, data) packages
+    rejected: list receiving a Rejection for every invalid package,
+    the rejections are discarded if None
+    validator: limits to check against, LIMITS by default
+    """
+    return filter_numbered_packages(enumerate(packages), rejected, validator)
+
+
+def split_packages(packages: Iterable[Package],
+                   validator: Optional[Validator] = None
+                   ) -> tuple[list[Package], list[Rejection]]:
+    """Split packages into the valid ones and a report of the others."""
+    rejected: list[Rejection] = []
+    valid = list(filter_packages(packages, rejected, validator))
+    return valid, rejected